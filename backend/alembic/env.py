@@ -0,0 +1,114 @@
+from logging.config import fileConfig
+
+from sqlalchemy import engine_from_config
+from sqlalchemy import inspect
+from sqlalchemy import pool
+
+from alembic import context
+
+from app.core.config import get_settings
+from app.models.models import Base
+
+# this is the Alembic Config object, which provides
+# access to the values within the .ini file in use.
+config = context.config
+
+# Interpret the config file for Python logging.
+# This line sets up loggers basically.
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# The database URL comes from the app settings (DATABASE_URL / .env),
+# unless one was passed explicitly (e.g. -x or a programmatic Config).
+if not config.get_main_option("sqlalchemy.url"):
+    config.set_main_option(
+        "sqlalchemy.url", get_settings().DATABASE_URL.replace("%", "%%")
+    )
+
+target_metadata = Base.metadata
+
+# Maintained by migrations only (PostgreSQL full-text search, 0004)
+DATABASE_ONLY = {"search_vector", "ix_articles_search_vector"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (reflected and compare_to is None and name in DATABASE_ONLY)
+
+
+# Tables of the initial schema (0001); databases built before migrations
+# existed (Base.metadata.create_all on startup) have exactly these
+BASELINE_REVISION = "0001"
+BASELINE_TABLES = {
+    "articles", "certificates", "company_info", "contact_submissions", "licenses",
+    "projects", "services", "statistics", "team_members", "users",
+}
+
+
+def stamp_pre_migration_database(connection) -> None:
+    """Mark a create_all-built database as being at 0001 so upgrades start after it."""
+    inspector = inspect(connection)
+    if inspector.has_table("alembic_version"):
+        return
+    existing = BASELINE_TABLES & set(inspector.get_table_names())
+    if existing == BASELINE_TABLES:
+        context.get_context().stamp(context.script, BASELINE_REVISION)
+
+# other values from the config, defined by the needs of env.py,
+# can be acquired:
+# my_important_option = config.get_main_option("my_important_option")
+# ... etc.
+
+
+def run_migrations_offline() -> None:
+    """Run migrations in 'offline' mode.
+
+    This configures the context with just a URL
+    and not an Engine, though an Engine is acceptable
+    here as well.  By skipping the Engine creation
+    we don't even need a DBAPI to be available.
+
+    Calls to context.execute() here emit the given string to the
+    script output.
+
+    """
+    url = config.get_main_option("sqlalchemy.url")
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations in 'online' mode.
+
+    In this scenario we need to create an Engine
+    and associate a connection with the context.
+
+    """
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object,
+        )
+
+        with context.begin_transaction():
+            stamp_pre_migration_database(connection)
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,230 @@
+"""initial schema
+
+Tables as previously created by ``Base.metadata.create_all``. Databases
+that were created that way should be stamped instead of upgraded:
+``alembic stamp 0001``.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 18:48:50.325201
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('articles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title_en', sa.String(length=255), nullable=False),
+    sa.Column('title_fa', sa.String(length=255), nullable=True),
+    sa.Column('slug', sa.String(length=255), nullable=False),
+    sa.Column('summary_en', sa.Text(), nullable=False),
+    sa.Column('summary_fa', sa.Text(), nullable=True),
+    sa.Column('content_en', sa.Text(), nullable=False),
+    sa.Column('content_fa', sa.Text(), nullable=True),
+    sa.Column('image_url', sa.String(length=500), nullable=True),
+    sa.Column('tags', sa.String(length=500), nullable=True),
+    sa.Column('category', sa.String(length=100), nullable=True),
+    sa.Column('author', sa.String(length=255), nullable=True),
+    sa.Column('is_published', sa.Boolean(), nullable=True),
+    sa.Column('publish_date', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_articles_category'), 'articles', ['category'], unique=False)
+    op.create_index(op.f('ix_articles_created_at'), 'articles', ['created_at'], unique=False)
+    op.create_index(op.f('ix_articles_id'), 'articles', ['id'], unique=False)
+    op.create_index(op.f('ix_articles_is_published'), 'articles', ['is_published'], unique=False)
+    op.create_index(op.f('ix_articles_publish_date'), 'articles', ['publish_date'], unique=False)
+    op.create_index(op.f('ix_articles_slug'), 'articles', ['slug'], unique=True)
+    op.create_index(op.f('ix_articles_title_en'), 'articles', ['title_en'], unique=False)
+    op.create_table('certificates',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title_en', sa.String(length=255), nullable=False),
+    sa.Column('title_fa', sa.String(length=255), nullable=True),
+    sa.Column('image_url', sa.String(length=500), nullable=True),
+    sa.Column('description_en', sa.Text(), nullable=True),
+    sa.Column('description_fa', sa.Text(), nullable=True),
+    sa.Column('issue_date', sa.String(length=50), nullable=True),
+    sa.Column('expiry_date', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_certificates_id'), 'certificates', ['id'], unique=False)
+    op.create_table('company_info',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description_en', sa.Text(), nullable=False),
+    sa.Column('description_fa', sa.Text(), nullable=True),
+    sa.Column('founded_year', sa.Integer(), nullable=True),
+    sa.Column('headquarters_location', sa.String(length=255), nullable=True),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('address_city', sa.String(length=100), nullable=True),
+    sa.Column('address_country', sa.String(length=100), nullable=True),
+    sa.Column('total_employees', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_company_info_id'), 'company_info', ['id'], unique=False)
+    op.create_table('contact_submissions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('phone', sa.String(length=20), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=True),
+    sa.Column('ip_address', sa.String(length=50), nullable=True),
+    sa.Column('user_agent', sa.String(length=500), nullable=True),
+    sa.Column('submitted_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_contact_submissions_email'), 'contact_submissions', ['email'], unique=False)
+    op.create_index(op.f('ix_contact_submissions_id'), 'contact_submissions', ['id'], unique=False)
+    op.create_index(op.f('ix_contact_submissions_name'), 'contact_submissions', ['name'], unique=False)
+    op.create_index(op.f('ix_contact_submissions_status'), 'contact_submissions', ['status'], unique=False)
+    op.create_index(op.f('ix_contact_submissions_submitted_at'), 'contact_submissions', ['submitted_at'], unique=False)
+    op.create_table('licenses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title_en', sa.String(length=255), nullable=False),
+    sa.Column('title_fa', sa.String(length=255), nullable=True),
+    sa.Column('image_url', sa.String(length=500), nullable=True),
+    sa.Column('description_en', sa.Text(), nullable=True),
+    sa.Column('description_fa', sa.Text(), nullable=True),
+    sa.Column('issue_date', sa.String(length=50), nullable=True),
+    sa.Column('issue_authority', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_licenses_id'), 'licenses', ['id'], unique=False)
+    op.create_table('projects',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title_en', sa.String(length=255), nullable=False),
+    sa.Column('title_fa', sa.String(length=255), nullable=True),
+    sa.Column('description_en', sa.Text(), nullable=False),
+    sa.Column('description_fa', sa.Text(), nullable=True),
+    sa.Column('image_url', sa.String(length=500), nullable=True),
+    sa.Column('archive_url', sa.String(length=500), nullable=True),
+    sa.Column('iframe_url', sa.String(length=500), nullable=True),
+    sa.Column('category', sa.String(length=50), nullable=True),
+    sa.Column('order', sa.Integer(), nullable=True),
+    sa.Column('is_featured', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_projects_category'), 'projects', ['category'], unique=False)
+    op.create_index(op.f('ix_projects_created_at'), 'projects', ['created_at'], unique=False)
+    op.create_index(op.f('ix_projects_id'), 'projects', ['id'], unique=False)
+    op.create_index(op.f('ix_projects_title_en'), 'projects', ['title_en'], unique=False)
+    op.create_table('services',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=False),
+    sa.Column('image_url', sa.String(length=500), nullable=True),
+    sa.Column('software_tools', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_services_category'), 'services', ['category'], unique=False)
+    op.create_index(op.f('ix_services_created_at'), 'services', ['created_at'], unique=False)
+    op.create_index(op.f('ix_services_id'), 'services', ['id'], unique=False)
+    op.create_index(op.f('ix_services_title'), 'services', ['title'], unique=False)
+    op.create_table('statistics',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('annual_projects', sa.Integer(), nullable=True),
+    sa.Column('service_types', sa.Integer(), nullable=True),
+    sa.Column('employees', sa.Integer(), nullable=True),
+    sa.Column('satisfied_clients', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_statistics_id'), 'statistics', ['id'], unique=False)
+    op.create_table('team_members',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name_en', sa.String(length=255), nullable=False),
+    sa.Column('name_fa', sa.String(length=255), nullable=True),
+    sa.Column('position_en', sa.String(length=255), nullable=True),
+    sa.Column('position_fa', sa.String(length=255), nullable=True),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('image_url', sa.String(length=500), nullable=True),
+    sa.Column('bio_en', sa.Text(), nullable=True),
+    sa.Column('bio_fa', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_team_members_email'), 'team_members', ['email'], unique=False)
+    op.create_index(op.f('ix_team_members_id'), 'team_members', ['id'], unique=False)
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(length=255), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('is_admin', sa.Boolean(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_team_members_id'), table_name='team_members')
+    op.drop_index(op.f('ix_team_members_email'), table_name='team_members')
+    op.drop_table('team_members')
+    op.drop_index(op.f('ix_statistics_id'), table_name='statistics')
+    op.drop_table('statistics')
+    op.drop_index(op.f('ix_services_title'), table_name='services')
+    op.drop_index(op.f('ix_services_id'), table_name='services')
+    op.drop_index(op.f('ix_services_created_at'), table_name='services')
+    op.drop_index(op.f('ix_services_category'), table_name='services')
+    op.drop_table('services')
+    op.drop_index(op.f('ix_projects_title_en'), table_name='projects')
+    op.drop_index(op.f('ix_projects_id'), table_name='projects')
+    op.drop_index(op.f('ix_projects_created_at'), table_name='projects')
+    op.drop_index(op.f('ix_projects_category'), table_name='projects')
+    op.drop_table('projects')
+    op.drop_index(op.f('ix_licenses_id'), table_name='licenses')
+    op.drop_table('licenses')
+    op.drop_index(op.f('ix_contact_submissions_submitted_at'), table_name='contact_submissions')
+    op.drop_index(op.f('ix_contact_submissions_status'), table_name='contact_submissions')
+    op.drop_index(op.f('ix_contact_submissions_name'), table_name='contact_submissions')
+    op.drop_index(op.f('ix_contact_submissions_id'), table_name='contact_submissions')
+    op.drop_index(op.f('ix_contact_submissions_email'), table_name='contact_submissions')
+    op.drop_table('contact_submissions')
+    op.drop_index(op.f('ix_company_info_id'), table_name='company_info')
+    op.drop_table('company_info')
+    op.drop_index(op.f('ix_certificates_id'), table_name='certificates')
+    op.drop_table('certificates')
+    op.drop_index(op.f('ix_articles_title_en'), table_name='articles')
+    op.drop_index(op.f('ix_articles_slug'), table_name='articles')
+    op.drop_index(op.f('ix_articles_publish_date'), table_name='articles')
+    op.drop_index(op.f('ix_articles_is_published'), table_name='articles')
+    op.drop_index(op.f('ix_articles_id'), table_name='articles')
+    op.drop_index(op.f('ix_articles_created_at'), table_name='articles')
+    op.drop_index(op.f('ix_articles_category'), table_name='articles')
+    op.drop_table('articles')
@@ -0,0 +1,54 @@
+"""composite and partial indexes for hot list queries
+
+- published articles by (publish_date, id), optionally filtered by category
+- projects ordered by (order, created_at DESC), optionally by category
+- services by category, newest first
+- contact submissions by status, then (submitted_at, id)
+
+On PostgreSQL the indexes are built CONCURRENTLY so the tables stay
+writable during the upgrade.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 19:05:12.481093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PUBLISHED = sa.text('is_published')
+
+INDEXES = [
+    ('ix_articles_published_publish_date', 'articles', ['publish_date', 'id'], PUBLISHED),
+    ('ix_articles_published_category', 'articles', ['category', 'publish_date', 'id'], PUBLISHED),
+    ('ix_projects_order_created_at', 'projects', ['order', sa.text('created_at DESC')], None),
+    ('ix_projects_category_order', 'projects', ['category', 'order', sa.text('created_at DESC')], None),
+    ('ix_services_category_created_at', 'services', ['category', 'created_at'], None),
+    ('ix_contact_submissions_status_submitted_at', 'contact_submissions', ['status', 'submitted_at', 'id'], None),
+    ('ix_contact_submissions_submitted_at_id', 'contact_submissions', ['submitted_at', 'id'], None),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_where=where, sqlite_where=where,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
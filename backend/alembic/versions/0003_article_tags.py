@@ -0,0 +1,84 @@
+"""article tags
+
+Normalized tags (tags + article_tags) with per-tag published article
+counts, backfilled from the comma-separated Article.tags column.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 18:50:27.224432
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('tags',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('article_count', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tags_id'), 'tags', ['id'], unique=False)
+    op.create_index(op.f('ix_tags_name'), 'tags', ['name'], unique=True)
+    op.create_table('article_tags',
+    sa.Column('article_id', sa.Integer(), nullable=False),
+    sa.Column('tag_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['article_id'], ['articles.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('article_id', 'tag_id')
+    )
+    op.create_index('ix_article_tags_tag_id_article_id', 'article_tags', ['tag_id', 'article_id'], unique=False)
+
+    if op.get_context().as_sql:
+        return  # offline SQL: backfill by re-saving articles or running online
+    conn = op.get_bind()
+    # Frozen copy of the tag parsing at this revision (no application imports)
+    names = []
+    pairs = []
+    for article_id, tags in conn.execute(sa.text('SELECT id, tags FROM articles')).all():
+        article_names = []
+        for part in (tags or '').split(','):
+            name = part.strip()[:100]
+            if name and name not in article_names:
+                article_names.append(name)
+        for name in article_names:
+            if name not in names:
+                names.append(name)
+            pairs.append((article_id, name))
+    if not names:
+        return
+
+    conn.execute(
+        sa.text('INSERT INTO tags (name, article_count) VALUES (:name, 0)'),
+        [{'name': name} for name in names]
+    )
+    tag_ids = dict(conn.execute(sa.text('SELECT name, id FROM tags')).all())
+    conn.execute(
+        sa.text('INSERT INTO article_tags (article_id, tag_id) VALUES (:article_id, :tag_id)'),
+        [{'article_id': article_id, 'tag_id': tag_ids[name]} for article_id, name in pairs]
+    )
+    conn.execute(sa.text(
+        'UPDATE tags SET article_count = ('
+        'SELECT count(*) FROM article_tags '
+        'JOIN articles ON articles.id = article_tags.article_id '
+        'WHERE article_tags.tag_id = tags.id AND articles.is_published'
+        ')'
+    ))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_article_tags_tag_id_article_id', table_name='article_tags')
+    op.drop_table('article_tags')
+    op.drop_index(op.f('ix_tags_name'), table_name='tags')
+    op.drop_index(op.f('ix_tags_id'), table_name='tags')
+    op.drop_table('tags')
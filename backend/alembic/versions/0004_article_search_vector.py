@@ -0,0 +1,62 @@
+"""article full-text search vector
+
+Stored generated tsvector over title (A), summary (B) and content (C)
+in English (stemmed) and Persian (PostgreSQL has no Persian dictionary,
+so those fields use the ``simple`` configuration), plus a GIN index.
+PostgreSQL only; other databases use the plain-text search fallback.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 19:31:40.118207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _weighted(config: str, column: str, weight: str, html: bool = False) -> str:
+    value = f"coalesce({column}, '')"
+    if html:
+        value = f"regexp_replace({value}, '<[^>]+>', ' ', 'g')"
+    return f"setweight(to_tsvector('{config}'::regconfig, {value}), '{weight}')"
+
+
+SEARCH_VECTOR = " || ".join([
+    _weighted('english', 'title_en', 'A'),
+    _weighted('simple', 'title_fa', 'A'),
+    _weighted('english', 'summary_en', 'B'),
+    _weighted('simple', 'summary_fa', 'B'),
+    _weighted('english', 'content_en', 'C', html=True),
+    _weighted('simple', 'content_fa', 'C', html=True),
+])
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    op.execute(
+        f"ALTER TABLE articles ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED"
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_articles_search_vector', 'articles', ['search_vector'],
+            postgresql_using='gin', postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_articles_search_vector', table_name='articles', postgresql_concurrently=True)
+    op.drop_column('articles', 'search_vector')
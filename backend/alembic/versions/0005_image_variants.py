@@ -0,0 +1,33 @@
+"""image variants
+
+Adds image_variants (resized WebP/JPEG copies of image_url) to the models
+with uploaded images. Existing images are processed on the next start.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 20:04:12.381920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('team_members', 'certificates', 'licenses', 'projects')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column('image_variants', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_column(table, 'image_variants')
@@ -1,83 +1,661 @@
-import redis
+import asyncio
+import base64
+import functools
+import inspect
 import json
-from typing import Optional, Any
+import math
+import random
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Any, Awaitable, Callable, Dict, Iterable, List, Tuple
+import redis.asyncio as aioredis
+from fastapi import Request, Response
+from pydantic import TypeAdapter
 from app.core.config import get_settings
+from app.core.metrics import metrics, flush_metrics
+from app.core.http_cache import (
+    make_etag, last_modified_of, is_not_modified,
+    compress_variants, negotiate_encoding
+)
 
 settings = get_settings()
 
-# Redis client
-redis_client: Optional[redis.Redis] = None
+# Redis client (asyncio, backed by a shared connection pool)
+redis_pool: Optional[aioredis.ConnectionPool] = None
+redis_client: Optional[aioredis.Redis] = None
 
+# Identifies this worker on the invalidation channel so it can skip its own messages
+WORKER_ID = uuid.uuid4().hex
+_invalidation_task: Optional[asyncio.Task] = None
+_metrics_task: Optional[asyncio.Task] = None
 
-def init_redis():
-    """Initialize Redis connection."""
-    global redis_client
+# Cache fills currently running in this worker, keyed by cache key
+_inflight: Dict[str, asyncio.Future] = {}
+
+# Monotonic time of the last write seen per namespace, here or on another worker
+_written_at: Dict[str, float] = {}
+
+# Called with namespace names whose entries should be re-filled right away
+# (registered by app.services.cache_warmup)
+refill_hooks: List[Callable[[Iterable[str]], None]] = []
+
+# Deletes the fill lock only if it is still held by the caller's token
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class LocalCache:
+    """Size-bounded, TTL-aware in-process LRU cache (L1 in front of Redis)."""
+
+    def __init__(self, max_entries: int, max_ttl: int):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: int):
+        if self.max_entries <= 0:
+            return
+        ttl = min(ttl, self.max_ttl)
+        if ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def delete(self, keys: Iterable[str]):
+        for key in keys:
+            self._data.pop(key, None)
+
+    def delete_prefix(self, prefix: str):
+        for key in [k for k in self._data if k.startswith(prefix)]:
+            self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+local_cache = LocalCache(
+    max_entries=settings.CACHE_L1_MAX_ENTRIES,
+    max_ttl=settings.CACHE_L1_MAX_TTL,
+)
+
+
+async def init_redis():
+    """Initialize Redis connection pool."""
+    global redis_pool, redis_client
     try:
-        redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
-        redis_client.ping()
+        redis_pool = aioredis.ConnectionPool.from_url(
+            settings.REDIS_URL,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            decode_responses=True,
+        )
+        redis_client = aioredis.Redis(connection_pool=redis_pool)
+        await redis_client.ping()
         print("✓ Redis connected successfully")
+        _start_invalidation_listener()
+        _start_metrics_flusher()
     except Exception as e:
         print(f"✗ Redis connection failed: {e}")
-        redis_client = None
+        await close_redis()
 
 
-async def get_cached(key: str) -> Optional[Any]:
-    """Get cached value."""
+async def close_redis():
+    """Close Redis client and release pooled connections."""
+    global redis_pool, redis_client, _invalidation_task, _metrics_task
+    for task in (_invalidation_task, _metrics_task):
+        if task is None:
+            continue
+        task.cancel()
+        try:
+            await task
+        except (asyncio.CancelledError, Exception):
+            pass
+    _invalidation_task = _metrics_task = None
+    if redis_client is not None:
+        try:
+            await flush_metrics(redis_client)
+        except Exception:
+            pass
+    local_cache.clear()
+    if redis_client is not None:
+        try:
+            await redis_client.close()
+        except Exception:
+            pass
+    if redis_pool is not None:
+        try:
+            await redis_pool.disconnect()
+        except Exception:
+            pass
+    redis_client = None
+    redis_pool = None
+
+
+def _start_metrics_flusher():
+    """Start the background task that pushes counters to Redis."""
+    global _metrics_task
+    if _metrics_task is None or _metrics_task.done():
+        _metrics_task = asyncio.create_task(_flush_metrics_periodically())
+
+
+async def _flush_metrics_periodically():
+    while redis_client is not None:
+        await asyncio.sleep(settings.METRICS_FLUSH_INTERVAL)
+        metrics.set_gauge("cache", "l1", "entries", len(local_cache))
+        try:
+            await flush_metrics(redis_client)
+        except Exception as e:
+            print(f"Metrics flush error: {e}")
+
+
+def _record(key: str, name: str, amount: float = 1.0):
+    """Count a cache event against the key's namespace (``cache:<ns>:...``)."""
+    parts = key.split(":", 2)
+    label = parts[1] if len(parts) > 1 and parts[0] == "cache" else "other"
+    metrics.incr("cache", label, name, amount)
+
+
+def _start_invalidation_listener():
+    """Start the background task that applies other workers' invalidations."""
+    global _invalidation_task
+    if _invalidation_task is None or _invalidation_task.done():
+        _invalidation_task = asyncio.create_task(_listen_for_invalidations())
+
+
+async def _listen_for_invalidations():
+    """Evict L1 entries announced on the invalidation channel."""
+    reconnecting = False
+    while redis_client is not None:
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+            # Messages may have been missed while (re)connecting
+            local_cache.clear()
+            if reconnecting:
+                # Redis may have restarted empty
+                _run_refill_hooks(CACHE_KEYS)
+            reconnecting = False
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    payload = json.loads(message["data"])
+                except (TypeError, ValueError):
+                    continue
+                if payload.get("origin") == WORKER_ID:
+                    continue
+                local_cache.delete(payload.get("keys", []))
+                for namespace, version in payload.get("versions", {}).items():
+                    _written_at[namespace] = time.monotonic()
+                    _set_local_version(namespace, version)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Cache invalidation listener error: {e}")
+            local_cache.clear()
+            reconnecting = True
+            await asyncio.sleep(1)
+        finally:
+            try:
+                await pubsub.close()
+            except Exception:
+                pass
+
+
+def _run_refill_hooks(namespaces: Iterable[str]):
+    namespaces = list(namespaces)
+    for hook in refill_hooks:
+        try:
+            hook(namespaces)
+        except Exception as e:
+            print(f"Cache refill hook error: {e}")
+
+
+def _invalidation_message(
+    keys: Iterable[str] = (),
+    versions: Optional[Dict[str, int]] = None
+) -> str:
+    """Build the message telling other workers which L1 entries to drop."""
+    return json.dumps({
+        "origin": WORKER_ID,
+        "keys": list(keys),
+        "versions": versions or {},
+    })
+
+
+def _version_key(namespace: str) -> str:
+    return f"{CACHE_KEYS[namespace]}:gen"
+
+
+def _set_local_version(namespace: str, version: int) -> int:
+    """
+    Record a namespace generation in L1 and drop entries of older ones.
+
+    Generations only move forward: a late pub/sub message or a slow Redis
+    reply carrying an older one is ignored. Returns the generation in effect.
+    """
+    if namespace not in CACHE_KEYS:
+        return int(version)
+    version = int(version)
+    current = local_cache.get(_version_key(namespace))
+    if current is not None and version <= current:
+        return current
+    if current is not None:
+        local_cache.delete_prefix(f"{CACHE_KEYS[namespace]}:v")
+    local_cache.set(_version_key(namespace), version, settings.CACHE_L1_MAX_TTL)
+    return version
+
+
+async def get_namespace_version(namespace: str) -> int:
+    """Get the current generation of a cache namespace."""
+    version = local_cache.get(_version_key(namespace))
+    if version is not None:
+        return version
     if redis_client is None:
-        return None
+        return 0
+    try:
+        version = int(await redis_client.get(_version_key(namespace)) or 0)
+        # An invalidation may have arrived while this GET was in flight
+        return _set_local_version(namespace, version)
+    except Exception as e:
+        print(f"Cache version error: {e}")
+    return 0
+
+
+async def build_cache_key(namespace: str, *parts: Any) -> str:
+    """
+    Build a versioned cache key, e.g. ``cache:team:v3:12``.
+
+    The namespace generation is part of every key, so bumping it with
+    ``invalidate_namespace`` makes all older entries unreachable at once.
+    """
+    version = await get_namespace_version(namespace)
+    return ":".join([f"{CACHE_KEYS[namespace]}:v{version}", *(str(p) for p in parts)])
+
+
+async def _read_entry(key: str) -> Optional[Dict[str, Any]]:
+    """Read the raw cache entry from Redis, bypassing L1."""
+    started = time.perf_counter()
     try:
-        value = redis_client.get(key)
-        if value:
-            return json.loads(value)
+        raw = await redis_client.get(key)
+        _record(key, "get_seconds", time.perf_counter() - started)
+        _record(key, "gets")
+        if raw:
+            _record(key, "hits_redis")
+            _record(key, "bytes_read", len(raw))
+            return json.loads(raw)
+        _record(key, "misses")
     except Exception as e:
+        _record(key, "errors")
         print(f"Cache get error: {e}")
     return None
 
 
-async def set_cache(key: str, value: Any, ttl: int = 3600):
-    """Set cached value with TTL."""
+async def _get_entry(key: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the raw cache entry (L1 first, then Redis).
+
+    Entries are ``{"v": value, "exp": logical expiry, "d": fill time}``;
+    Redis keeps them ``CACHE_STALE_TTL`` seconds past ``exp`` so they can
+    be served stale while a single caller recomputes them.
+    """
+    if redis_client is None:
+        return None
+    entry = local_cache.get(key)
+    if entry is not None:
+        _record(key, "hits_l1")
+        return entry
+    entry = await _read_entry(key)
+    if entry is not None:
+        # Only fresh entries go to L1, and only until their logical expiry
+        local_cache.set(key, entry, entry["exp"] - time.time())
+    return entry
+
+
+def _jittered(ttl: int) -> int:
+    """Spread expiries so entries written together do not expire together."""
+    jitter = settings.CACHE_TTL_JITTER
+    return max(1, int(ttl * random.uniform(1 - jitter, 1 + jitter)))
+
+
+def _should_refresh(entry: Dict[str, Any]) -> bool:
+    """Expired, or picked for probabilistic early recomputation (XFetch)."""
+    delta = entry.get("d", 0) * settings.CACHE_EARLY_REFRESH_BETA
+    return time.time() - delta * math.log(1 - random.random()) >= entry["exp"]
+
+
+async def get_cached(key: str) -> Optional[Any]:
+    """Get cached value."""
+    entry = await _get_entry(key)
+    return entry["v"] if entry is not None else None
+
+
+async def set_cache(key: str, value: Any, ttl: int = 3600, fill_time: float = 0.0):
+    """Set cached value with (jittered) TTL."""
     if redis_client is None:
         return
+    ttl = _jittered(ttl)
+    entry = {"v": value, "exp": time.time() + ttl, "d": fill_time}
+    started = time.perf_counter()
     try:
-        redis_client.setex(key, ttl, json.dumps(value, default=str))
+        raw = json.dumps(entry, default=str)
+        await redis_client.setex(key, ttl + settings.CACHE_STALE_TTL, raw)
+        local_cache.set(key, entry, ttl)
+        _record(key, "sets")
+        _record(key, "set_seconds", time.perf_counter() - started)
+        _record(key, "bytes_written", len(raw))
     except Exception as e:
+        _record(key, "errors")
         print(f"Cache set error: {e}")
 
 
-async def delete_cache(key: str):
-    """Delete cached value."""
+async def _acquire_fill_lock(key: str) -> Optional[str]:
+    """Take the distributed fill lock for ``key``; returns its token or None."""
+    token = uuid.uuid4().hex
+    try:
+        acquired = await redis_client.set(
+            f"{key}:lock", token, nx=True,
+            px=int(settings.CACHE_LOCK_TIMEOUT * 1000)
+        )
+        return token if acquired else None
+    except Exception as e:
+        print(f"Cache lock error: {e}")
+        # Without Redis coordination, fall back to filling locally
+        return token
+
+
+async def _release_fill_lock(key: str, token: str):
+    try:
+        await redis_client.eval(_RELEASE_LOCK_SCRIPT, 1, f"{key}:lock", token)
+    except Exception as e:
+        print(f"Cache unlock error: {e}")
+
+
+async def _fill(key: str, loader: Callable[[], Awaitable[Any]], ttl: int) -> Any:
+    started = time.perf_counter()
+    value = await loader()
+    fill_time = time.perf_counter() - started
+    _record(key, "fills")
+    _record(key, "fill_seconds", fill_time)
+    await set_cache(key, value, ttl, fill_time=fill_time)
+    return value
+
+
+async def _fill_once(
+    key: str,
+    loader: Callable[[], Awaitable[Any]],
+    ttl: int,
+    stale: Optional[Dict[str, Any]]
+) -> Any:
+    """Fill ``key`` holding the distributed lock, or wait for whoever holds it."""
     if redis_client is None:
+        return await loader()
+
+    token = await _acquire_fill_lock(key)
+    if token is not None:
+        try:
+            # Whoever held the lock before us may have refilled the entry already
+            current = await _read_entry(key)
+            if (
+                current is not None and time.time() < current["exp"]
+                and (stale is None or current["exp"] != stale["exp"])
+            ):
+                return current["v"]
+            return await _fill(key, loader, ttl)
+        finally:
+            await _release_fill_lock(key, token)
+
+    # Another worker is filling: serve the stale value, or wait for the fresh one
+    if stale is not None:
+        _record(key, "stale_served")
+        return stale["v"]
+    _record(key, "lock_waits")
+    deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(settings.CACHE_LOCK_POLL_INTERVAL)
+        entry = await _get_entry(key)
+        if entry is not None:
+            return entry["v"]
+    return await _fill(key, loader, ttl)
+
+
+async def get_or_set(
+    key: str,
+    loader: Callable[[], Awaitable[Any]],
+    ttl: int = 3600
+) -> Any:
+    """
+    Get a cached value, filling it with ``loader`` on a miss.
+
+    Only one caller per key runs ``loader`` at a time: concurrent callers
+    in this worker share its result, other workers wait on a Redis lock.
+    Entries are refreshed probabilistically shortly before they expire,
+    and while a refresh runs everybody else is served the current value.
+    """
+    entry = await _get_entry(key)
+    if entry is not None and not _should_refresh(entry):
+        return entry["v"]
+
+    inflight = _inflight.get(key)
+    if inflight is not None:
+        if entry is not None:
+            _record(key, "stale_served")
+            return entry["v"]
+        _record(key, "coalesced")
+        try:
+            return await asyncio.shield(inflight)
+        except asyncio.CancelledError:
+            if not inflight.cancelled() or asyncio.current_task().cancelling():
+                raise
+            # The caller filling the entry went away (e.g. its client
+            # disconnected): take over the fill instead of failing too
+            return await get_or_set(key, loader, ttl)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        value = await _fill_once(key, loader, ttl, entry)
+        future.set_result(value)
+        return value
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Mark retrieved so an unawaited failure is not logged
+        future.exception()
+        raise
+    finally:
+        _inflight.pop(key, None)
+
+
+def cached_endpoint(namespace: str, response_model: Any, ttl: int = 3600):
+    """
+    Cache a GET endpoint's final JSON body.
+
+    The endpoint just returns ORM objects; on a miss they are validated
+    against ``response_model`` and serialized once, and the JSON text is
+    stored through ``get_or_set`` together with its ETag and Last-Modified
+    (newest ``updated_at``) and gzip/br variants. Every request, hit or
+    miss, gets a raw ``Response`` in the encoding negotiated from
+    Accept-Encoding, so FastAPI does not validate, serialize or compress
+    it again, and a matching If-None-Match / If-Modified-Since gets a 304.
+
+    Scalar endpoint arguments (path and query parameters) become part of
+    the cache key; dependencies such as the DB session are ignored.
+
+    Usage::
+
+        @router.get("", response_model=List[ServiceResponse])
+        @cached_endpoint('services', List[ServiceResponse], ttl=CACHE_TTL['services'])
+        async def get_services(category: str = None, db: AsyncSession = Depends(get_db)):
+            ...
+    """
+    adapter = TypeAdapter(response_model)
+
+    def decorator(func):
+        async def cache_key_for(kwargs) -> str:
+            # JSON keeps None, "None", True and "True" apart
+            params = [
+                f"{name}:{json.dumps(value)}" for name, value in sorted(kwargs.items())
+                if value is None or isinstance(value, (str, int, float, bool))
+            ]
+            return await build_cache_key(namespace, func.__name__, *params)
+
+        async def render(*args, **kwargs) -> Dict[str, Any]:
+            result = await func(*args, **kwargs)
+            validated = adapter.validate_python(result, from_attributes=True)
+            body = adapter.dump_json(validated)
+            return {
+                "body": body.decode(),
+                "etag": make_etag(body),
+                "modified": last_modified_of(validated),
+                "variants": compress_variants(body, settings.CACHE_COMPRESS_MIN_SIZE),
+            }
+
+        @functools.wraps(func)
+        async def wrapper(*args, _request: Request, **kwargs):
+            key = await cache_key_for(kwargs)
+            cached = await get_or_set(key, lambda: render(*args, **kwargs), ttl)
+            headers = {
+                "ETag": cached["etag"],
+                "Cache-Control": "public, no-cache",
+                "Vary": "Accept-Encoding",
+            }
+            if cached["modified"]:
+                headers["Last-Modified"] = cached["modified"]
+            if is_not_modified(_request, cached["etag"], cached["modified"]):
+                return Response(status_code=304, headers=headers)
+
+            variants = cached.get("variants") or {}
+            encoding = negotiate_encoding(_request, variants)
+            if encoding is None:
+                content = cached["body"]
+            else:
+                content = base64.b64decode(variants[encoding])
+                headers["Content-Encoding"] = encoding
+            return Response(content=content, media_type="application/json", headers=headers)
+
+        async def warm(**kwargs) -> bool:
+            """
+            Fill the entry for these arguments unless it is already cached.
+
+            Arguments must be passed exactly as FastAPI would (every
+            query parameter, plus dependencies such as ``db``). Returns
+            whether this call filled the entry; it skips when another
+            worker holds the fill lock.
+            """
+            if redis_client is None:
+                return False
+            key = await cache_key_for(kwargs)
+            if await _get_entry(key) is not None:
+                return False
+            token = await _acquire_fill_lock(key)
+            if token is None:
+                return False
+            try:
+                await _fill(key, lambda: render(**kwargs), ttl)
+                return True
+            finally:
+                await _release_fill_lock(key, token)
+
+        wrapper.warm = warm
+
+        # Let FastAPI inject the request alongside the endpoint's own parameters
+        signature = inspect.signature(func)
+        wrapper.__signature__ = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter("_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+        ])
+        return wrapper
+
+    return decorator
+
+
+async def delete_cache(*keys: str):
+    """Delete one or more cached values in a single round trip."""
+    if redis_client is None or not keys:
         return
+    local_cache.delete(keys)
     try:
-        redis_client.delete(key)
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.delete(*keys)
+            pipe.publish(settings.CACHE_INVALIDATION_CHANNEL, _invalidation_message(keys=keys))
+            await pipe.execute()
     except Exception as e:
         print(f"Cache delete error: {e}")
 
 
-async def invalidate_pattern(pattern: str):
-    """Invalidate cache keys matching pattern."""
-    if redis_client is None:
+async def invalidate_namespace(*namespaces: str):
+    """
+    Invalidate every entry of the given namespaces.
+
+    Each namespace costs a single INCR of its generation counter; stale
+    entries are never read again and expire through their own TTL.
+    """
+    for namespace in namespaces:
+        _written_at[namespace] = time.monotonic()
+    if redis_client is None or not namespaces:
         return
     try:
-        keys = redis_client.keys(pattern)
-        if keys:
-            redis_client.delete(*keys)
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for namespace in namespaces:
+                pipe.incr(_version_key(namespace))
+            versions = dict(zip(namespaces, await pipe.execute()))
+        for namespace, version in versions.items():
+            _set_local_version(namespace, version)
+            metrics.incr("cache", namespace, "invalidations")
+        await redis_client.publish(
+            settings.CACHE_INVALIDATION_CHANNEL,
+            _invalidation_message(versions=versions),
+        )
     except Exception as e:
+        local_cache.clear()
         print(f"Cache invalidate error: {e}")
+        return
+    if settings.CACHE_REFILL_ON_WRITE:
+        _run_refill_hooks(namespaces)
+
+
+def written_recently(namespace: str, window: float) -> bool:
+    """Whether ``namespace`` was invalidated by a write within ``window`` seconds."""
+    written_at = _written_at.get(namespace)
+    return written_at is not None and time.monotonic() - written_at < window
 
 
-# Cache key prefixes
+# Cache namespaces (each carries a generation counter, see build_cache_key)
 CACHE_KEYS = {
     "services": "cache:services",
-    "service_detail": "cache:service:{id}",
     "team": "cache:team",
-    "team_member": "cache:team:{id}",
     "certificates": "cache:certificates",
     "licenses": "cache:licenses",
     "company_info": "cache:company_info",
     "statistics": "cache:statistics",
     "projects": "cache:projects",
     "articles": "cache:articles",
+    "principals": "cache:principals",
 }
 
 
@@ -91,4 +669,5 @@ CACHE_TTL = {
     "statistics": 7200,
     "projects": 3600,
     "articles": 1800,  # 30 minutes for articles (more frequent updates)
+    "principals": 60,  # authenticated users; short so missed invalidations heal quickly
 }
@@ -0,0 +1,186 @@
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, TypeVar
+
+from app.core.config import get_settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+T = TypeVar("T")
+
+# Bounded pool for blocking work (file IO, CPU-bound helpers) started from
+# async handlers; extra calls queue instead of spawning threads.
+_executor = ThreadPoolExecutor(
+    max_workers=settings.BLOCKING_POOL_SIZE,
+    thread_name_prefix="blocking",
+)
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable in the bounded thread pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+# Password hashing is pure CPU and holds the GIL, so it gets its own
+# processes; jobs beyond the cap wait here rather than in the pool.
+PASSWORD_HASH_WORKERS = settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+PASSWORD_HASH_MAX_CONCURRENCY = settings.PASSWORD_HASH_MAX_CONCURRENCY or PASSWORD_HASH_WORKERS
+
+_password_executor: Optional[ProcessPoolExecutor] = None
+_password_executor_lock = threading.Lock()
+_password_slots = asyncio.Semaphore(PASSWORD_HASH_MAX_CONCURRENCY)
+_password_waiting = 0
+
+
+def _get_password_executor() -> ProcessPoolExecutor:
+    global _password_executor
+    with _password_executor_lock:
+        if _password_executor is None:
+            # spawn: forking a process that already runs threads is unsafe
+            # (workers re-import __main__; see app.core.passwords)
+            _password_executor = ProcessPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _password_executor
+
+
+def _discard_password_executor(failed: ProcessPoolExecutor):
+    """Drop ``failed`` unless another job already replaced it with a fresh pool."""
+    global _password_executor
+    with _password_executor_lock:
+        if _password_executor is not failed:
+            return
+        _password_executor = None
+    failed.shutdown(wait=False, cancel_futures=True)
+
+
+def _report_password_queue():
+    metrics.set_gauge("auth", "password_hash", "queue_depth", _password_waiting)
+
+
+async def run_password_hashing(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run a password hash or verify (see ``app.core.passwords``) in the
+    password worker processes.
+
+    At most ``PASSWORD_HASH_MAX_CONCURRENCY`` jobs run at once; the number
+    waiting for a slot is exported as the ``auth.password_hash.queue_depth``
+    gauge, and time spent waiting as ``queue_seconds``.
+    """
+    global _password_waiting
+    queued_at = time.perf_counter()
+    _password_waiting += 1
+    _report_password_queue()
+    try:
+        await _password_slots.acquire()
+    finally:
+        _password_waiting -= 1
+        _report_password_queue()
+    try:
+        started = time.perf_counter()
+        metrics.incr("auth", "password_hash", "queue_seconds", started - queued_at)
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args)
+        executor = _get_password_executor()
+        try:
+            result = await loop.run_in_executor(executor, call)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); the pool is unusable from now on.
+            # Jobs failing together must not tear down each other's replacement.
+            logger.warning("Password worker pool broken; starting a new one")
+            _discard_password_executor(executor)
+            result = await loop.run_in_executor(_get_password_executor(), call)
+        metrics.incr("auth", "password_hash", "jobs")
+        metrics.incr("auth", "password_hash", "run_seconds", time.perf_counter() - started)
+        return result
+    finally:
+        _password_slots.release()
+
+
+def start_password_workers():
+    """Start the password worker processes ahead of the first login."""
+    executor = _get_password_executor()
+    for _ in range(PASSWORD_HASH_WORKERS):
+        executor.submit(int)
+
+
+def shutdown_executor():
+    """Wait for queued blocking work to finish (application shutdown)."""
+    global _password_executor
+    _executor.shutdown(wait=True)
+    with _password_executor_lock:
+        executor, _password_executor = _password_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+class LoopBlockDetector:
+    """
+    Log when the event loop is held longer than ``threshold_ms``.
+
+    A heartbeat coroutine stamps the time every few milliseconds; a
+    watchdog thread notices when the stamp goes stale and logs the loop
+    thread's current stack, which points at the handler doing blocking
+    work. Intended for DEBUG mode only.
+    """
+
+    def __init__(self, threshold_ms: int):
+        self.threshold = threshold_ms / 1000
+        self.interval = max(self.threshold / 4, 0.005)
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-block-detector", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Event loop block detector enabled ({self.threshold * 1000:.0f} ms)")
+
+    async def stop(self):
+        self._stop.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+
+    async def _heartbeat(self):
+        while True:
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _watch(self):
+        reported_beat = None
+        while not self._stop.wait(self.interval):
+            beat = self._last_beat
+            blocked_for = time.monotonic() - beat
+            if blocked_for < self.threshold + self.interval or beat == reported_beat:
+                continue
+            reported_beat = beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "<unavailable>"
+            logger.warning(
+                f"Event loop blocked for more than {blocked_for * 1000:.0f} ms; "
+                f"loop thread stack:\n{stack}"
+            )
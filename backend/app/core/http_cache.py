@@ -0,0 +1,157 @@
+import base64
+import gzip
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi import Request
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+def make_etag(body: bytes) -> str:
+    """
+    ETag from the response body.
+
+    Weak, so the same validator covers the identity, gzip and br
+    representations of one payload.
+    """
+    return 'W/"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def compress_variants(body: bytes, min_size: int) -> Dict[str, str]:
+    """Pre-compressed encodings of ``body`` (base64, so they fit in a JSON cache entry)."""
+    if len(body) < min_size:
+        return {}
+    variants = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=9)
+    return {
+        encoding: base64.b64encode(data).decode()
+        for encoding, data in variants.items()
+        if len(data) < len(body)
+    }
+
+
+def negotiate_encoding(request: Request, available: Iterable[str]) -> Optional[str]:
+    """Pick the best of ``available`` encodings allowed by Accept-Encoding."""
+    accepted: Dict[str, float] = {}
+    for item in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = item.strip().partition(";")
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    # Preference order on ties: br compresses JSON/HTML better than gzip
+    for encoding in ("br", "gzip"):
+        if encoding not in available:
+            continue
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def last_modified_of(data: Any) -> Optional[str]:
+    """
+    HTTP date of the newest ``updated_at`` in a response model or list of them.
+
+    Timestamps are stored as naive UTC (``datetime.utcnow``).
+    """
+    if isinstance(getattr(data, "items", None), list):  # CursorPage
+        data = data.items
+    items = data if isinstance(data, (list, tuple)) else [data]
+    stamps = [
+        getattr(item, "updated_at", None) for item in items
+        if isinstance(getattr(item, "updated_at", None), datetime)
+    ]
+    if not stamps:
+        return None
+    newest = max(stamps)
+    if newest.tzinfo is None:
+        newest = newest.replace(tzinfo=timezone.utc)
+    return format_datetime(newest.replace(microsecond=0), usegmt=True)
+
+
+def is_not_modified(
+    request: Request,
+    etag: Optional[str],
+    last_modified: Optional[str]
+) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since (RFC 9110 13.2.2)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison: W/"x" matches "x"
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag.removeprefix("W/") in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+            modified = parsedate_to_datetime(last_modified)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return modified <= since
+
+    return False
+
+
+# Content types worth compressing; images, video, fonts and archives are
+# already compressed, so gzip only costs CPU on them
+_COMPRESSIBLE_TYPES = (
+    "text/", "application/json", "application/javascript", "application/xml",
+    "application/manifest+json", "image/svg+xml",
+)
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith(_COMPRESSIBLE_TYPES) or media_type.endswith(("+json", "+xml"))
+
+
+class _CompressibleGZipResponder(GZipResponder):
+    passthrough = False
+
+    async def send_with_gzip(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            self.passthrough = not is_compressible(content_type)
+        if self.passthrough:
+            await self.send(message)
+            return
+        await super().send_with_gzip(message)
+
+
+class CompressibleGZipMiddleware(GZipMiddleware):
+    """``GZipMiddleware`` that leaves already-compressed content types alone."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = _CompressibleGZipResponder(
+                self.app, self.minimum_size, compresslevel=self.compresslevel
+            )
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
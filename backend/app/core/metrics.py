@@ -0,0 +1,73 @@
+from collections import defaultdict
+from typing import Dict, Tuple
+
+# (group, label, name), e.g. ("cache", "team", "hits")
+MetricKey = Tuple[str, str, str]
+
+
+class MetricsRegistry:
+    """
+    In-process counters, grouped and labelled.
+
+    Totals are kept for this worker; ``drain`` hands out the increments
+    since the previous call so they can be summed across workers in Redis.
+    """
+
+    def __init__(self):
+        self._totals: Dict[MetricKey, float] = defaultdict(float)
+        self._pending: Dict[MetricKey, float] = defaultdict(float)
+
+    def incr(self, group: str, label: str, name: str, amount: float = 1.0):
+        key = (group, label, name)
+        self._totals[key] += amount
+        self._pending[key] += amount
+
+    def set_gauge(self, group: str, label: str, name: str, value: float):
+        """Record a point-in-time value (not summed across workers)."""
+        self._totals[(group, label, name)] = value
+
+    def drain(self) -> Dict[MetricKey, float]:
+        pending, self._pending = self._pending, defaultdict(float)
+        return dict(pending)
+
+    def restore(self, pending: Dict[MetricKey, float]):
+        """Put back increments whose flush failed."""
+        for key, amount in pending.items():
+            self._pending[key] += amount
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        result: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (group, label, name), value in self._totals.items():
+            result.setdefault(group, {}).setdefault(label, {})[name] = value
+        return result
+
+
+metrics = MetricsRegistry()
+
+
+async def flush_metrics(client) -> None:
+    """Add this worker's pending increments to the shared Redis hashes."""
+    pending = metrics.drain()
+    if not pending:
+        return
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            for (group, label, name), amount in pending.items():
+                pipe.sadd("metrics:groups", group)
+                pipe.hincrbyfloat(f"metrics:{group}", f"{label}:{name}", amount)
+            await pipe.execute()
+    except Exception:
+        metrics.restore(pending)
+        raise
+
+
+async def read_metrics(client) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Counters summed over all workers (as of their last flush)."""
+    groups = await client.smembers("metrics:groups")
+    result: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for group in sorted(groups):
+        values = await client.hgetall(f"metrics:{group}")
+        for field, value in values.items():
+            label, _, name = field.rpartition(":")
+            result.setdefault(group, {}).setdefault(label, {})[name] = float(value)
+    return result
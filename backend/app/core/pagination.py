@@ -0,0 +1,86 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def encode_cursor(values: Sequence[Any], direction: str) -> str:
+    """Opaque cursor for the row with these key values."""
+    payload = {
+        "k": [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        "d": direction,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> Dict[str, Any]:
+    """Parse a cursor built by ``encode_cursor``; 400 if it was tampered with."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = payload["k"]
+        if payload["d"] not in ("next", "prev") or len(values) != len(types):
+            raise ValueError("malformed cursor")
+        keys = [
+            datetime.fromisoformat(v) if t is datetime else t(v)
+            for v, t in zip(values, types)
+        ]
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return {"keys": keys, "direction": payload["d"]}
+
+
+async def keyset_page(
+    db: AsyncSession,
+    query: Select,
+    columns: Sequence[Any],
+    cursor: Optional[str],
+    limit: int
+) -> Dict[str, Any]:
+    """
+    Fetch one page of ``query`` newest-first on ``columns`` (e.g. date, id).
+
+    Instead of OFFSET the page starts right after the cursor row, using a
+    row-value comparison the (date, id) index can seek to, so every page
+    costs the same. An empty ``cursor`` returns the first page. Returns
+    ``items`` plus opaque ``next_cursor`` / ``prev_cursor`` (None at either
+    end).
+    """
+    key = tuple_(*columns)
+    direction = "next"
+    if cursor:
+        decoded = decode_cursor(cursor, [c.type.python_type for c in columns])
+        direction = decoded["direction"]
+        boundary = tuple_(*decoded["keys"])
+        query = query.where(key < boundary if direction == "next" else key > boundary)
+
+    if direction == "next":
+        query = query.order_by(*(c.desc() for c in columns))
+    else:
+        query = query.order_by(*(c.asc() for c in columns))
+
+    rows: List[Any] = list((await db.scalars(query.limit(limit + 1))).all())
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == "prev":
+        rows.reverse()
+
+    def key_of(row):
+        return [getattr(row, c.key) for c in columns]
+
+    # Coming from a cursor means there are rows on the side we came from
+    has_next = has_more if direction == "next" else True
+    has_prev = bool(cursor) if direction == "next" else has_more
+    return {
+        "items": rows,
+        "next_cursor": encode_cursor(key_of(rows[-1]), "next") if rows and has_next else None,
+        "prev_cursor": encode_cursor(key_of(rows[0]), "prev") if rows and has_prev else None,
+    }
@@ -0,0 +1,27 @@
+"""
+Password hashing primitives.
+
+Kept free of application imports: they run in the password worker
+processes (see ``app.core.concurrency.run_password_hashing``), which
+unpickle calls into this module.
+
+The workers are started with ``spawn``, so each one also re-imports the
+parent's ``__main__`` module. Any script that can hash passwords (app
+entry points, seeders, benchmarks) must keep its startup code under an
+``if __name__ == "__main__":`` guard; otherwise every worker re-runs it
+and the pool fails with ``BrokenProcessPool``. ``uvicorn main:app`` is
+safe because uvicorn's own ``__main__`` is guarded.
+"""
+from passlib.context import CryptContext
+
+pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+
+
+def hash_password(password: str) -> str:
+    """Hash a password."""
+    return pwd_context.hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash."""
+    return pwd_context.verify(plain_password, hashed_password)
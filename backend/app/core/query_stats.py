@@ -0,0 +1,111 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+MAX_LOGGED_STATEMENT = 500
+
+
+class QueryStats:
+    """SQL statements issued while handling one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter = Counter()
+        self.last_parameters: Dict[str, str] = {}
+
+    def record(self, statement: str, parameters, seconds: float, executemany: bool = False):
+        self.count += 1
+        self.seconds += seconds
+        # One executemany batch is a single deliberate statement, not an N+1 loop
+        if not executemany:
+            # Keyed on the SQL text alone: an N+1 loop repeats it with other parameters
+            self.statements[statement] += 1
+            self.last_parameters[statement] = repr(parameters)
+
+    def repeated(self, threshold: int):
+        """(statement, last parameters, times) for SQL run at least ``threshold`` times."""
+        return [
+            (statement, self.last_parameters[statement], times)
+            for statement, times in self.statements.items()
+            if times >= threshold
+        ]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.seconds * 1000:.1f};desc="{self.count} queries"'
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_request() -> QueryStats:
+    """Begin collecting statements for the current request."""
+    stats = QueryStats()
+    _current.set(stats)
+    return stats
+
+
+def _shorten(statement: str) -> str:
+    statement = " ".join(statement.split())
+    if len(statement) > MAX_LOGGED_STATEMENT:
+        return statement[:MAX_LOGGED_STATEMENT] + "..."
+    return statement
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, parameters, elapsed, executemany)
+    if settings.DB_SLOW_QUERY_MS and elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.1f} ms): {_shorten(statement)} "
+            f"params={_shorten(repr(parameters))}"
+        )
+
+
+def _handle_error(exception_context):
+    # The failed statement never reaches after_cursor_execute
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine: Engine):
+    """Time every statement run through ``engine`` (a sync engine)."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def log_repeated_queries(stats: QueryStats, method: str, path: str):
+    """Warn about requests running too many statements, or the same SQL repeatedly."""
+    if settings.DB_QUERY_COUNT_THRESHOLD and stats.count > settings.DB_QUERY_COUNT_THRESHOLD:
+        logger.warning(
+            f"{method} {path} ran {stats.count} queries "
+            f"({stats.seconds * 1000:.1f} ms in the database)"
+        )
+    threshold = settings.DB_REPEATED_QUERY_THRESHOLD
+    if not threshold:
+        return
+    for statement, parameters, times in stats.repeated(threshold):
+        logger.warning(
+            f"{method} {path} ran the same query {times} times: "
+            f"{_shorten(statement)} last params={_shorten(parameters)}"
+        )
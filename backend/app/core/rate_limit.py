@@ -0,0 +1,170 @@
+import ipaddress
+import re
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Deque, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response, status
+
+from app import cache
+from app.core.config import get_settings
+from app.core.metrics import metrics
+
+settings = get_settings()
+
+# Sliding window over a sorted set of request timestamps (ms), in one round
+# trip: drop entries older than the window, then admit and record the
+# request if fewer than ``limit`` remain.
+# Returns {allowed, remaining, retry_after_ms}.
+_SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", now - window)
+local count = redis.call("ZCARD", KEYS[1])
+if count < limit then
+    redis.call("ZADD", KEYS[1], now, ARGV[4])
+    redis.call("PEXPIRE", KEYS[1], window)
+    return {1, limit - count - 1, 0}
+end
+local oldest = redis.call("ZRANGE", KEYS[1], 0, 0, "WITHSCORES")
+return {0, 0, tonumber(oldest[2]) + window - now}
+"""
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_LIMIT_RE = re.compile(r"^\s*(\d+)\s*/\s*(\d*)\s*(second|minute|hour|day)s?\s*$")
+
+
+def parse_limit(value: str) -> Tuple[int, int]:
+    """Parse ``"5/minute"`` or ``"20/15minutes"`` into (requests, window ms)."""
+    match = _LIMIT_RE.match(value or "")
+    if not match:
+        raise ValueError(f"Invalid rate limit: {value!r}")
+    count, multiplier, period = match.groups()
+    return int(count), int(multiplier or 1) * _PERIODS[period] * 1000
+
+
+class LocalSlidingWindow:
+    """
+    Per-worker sliding-window counters, used while Redis is unavailable.
+
+    Limits then apply per worker instead of cluster-wide; the number of
+    tracked keys is bounded (least recently used are dropped).
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._hits: "OrderedDict[str, Deque[float]]" = OrderedDict()
+
+    def hit(self, key: str, limit: int, window_ms: int) -> Tuple[bool, int, int]:
+        now = time.time() * 1000
+        hits = self._hits.pop(key, None) or deque()
+        while hits and hits[0] <= now - window_ms:
+            hits.popleft()
+        self._hits[key] = hits
+        if len(self._hits) > self.max_keys:
+            self._hits.popitem(last=False)
+        if len(hits) < limit:
+            hits.append(now)
+            return True, limit - len(hits), 0
+        return False, 0, int(hits[0] + window_ms - now)
+
+
+local_windows = LocalSlidingWindow(settings.RATE_LIMIT_LOCAL_MAX_KEYS)
+
+
+async def _hit(key: str, limit: int, window_ms: int) -> Tuple[bool, int, int]:
+    """Record a request under ``key``; returns (allowed, remaining, retry after ms)."""
+    if cache.redis_client is not None:
+        now = int(time.time() * 1000)
+        try:
+            allowed, remaining, retry_after = await cache.redis_client.eval(
+                _SLIDING_WINDOW_SCRIPT, 1, key,
+                now, window_ms, limit, f"{now}:{uuid.uuid4().hex[:8]}"
+            )
+            return bool(allowed), int(remaining), int(retry_after)
+        except Exception as e:
+            print(f"Rate limit error: {e}")
+    metrics.incr("rate_limit", "local", "fallbacks")
+    return local_windows.hit(key, limit, window_ms)
+
+
+def _exempt_ips() -> set:
+    return {ip.strip() for ip in settings.RATE_LIMIT_EXEMPT_IPS.split(",") if ip.strip()}
+
+
+_trusted_proxies = [
+    ipaddress.ip_network(network.strip(), strict=False)
+    for network in settings.TRUSTED_PROXIES.split(",") if network.strip()
+]
+
+
+def _is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in _trusted_proxies)
+
+
+def client_ip(request: Request) -> Optional[str]:
+    """
+    Address of the client that sent ``request``.
+
+    X-Forwarded-For / X-Real-IP are only believed when the connection comes
+    from one of ``TRUSTED_PROXIES``; anyone else could set them to anything.
+    """
+    peer = request.client.host if request.client else None
+    if peer is None or not _is_trusted_proxy(peer):
+        return peer
+    forwarded = [
+        address.strip()
+        for address in request.headers.get("x-forwarded-for", "").split(",")
+        if address.strip()
+    ]
+    # Each proxy appends the address it received from: the first one from
+    # the right that is not our own proxy is the client
+    for address in reversed(forwarded):
+        if not _is_trusted_proxy(address):
+            return address
+    if forwarded:
+        return forwarded[0]
+    return request.headers.get("x-real-ip", "").strip() or peer
+
+
+def rate_limit(name: str):
+    """
+    Dependency limiting a route per client IP.
+
+    The limit comes from ``settings.RATE_LIMIT_<NAME>`` (e.g. "5/minute");
+    an empty value disables it. Rejected requests get 429 with Retry-After.
+    """
+    value = getattr(settings, f"RATE_LIMIT_{name.upper()}")
+    limit, window_ms = parse_limit(value) if value else (0, 0)
+    exempt = _exempt_ips()
+
+    async def dependency(request: Request, response: Response):
+        if not settings.RATE_LIMIT_ENABLED or not limit:
+            return
+        address = client_ip(request) or "unknown"
+        if address in exempt:
+            return
+
+        allowed, remaining, retry_after_ms = await _hit(f"ratelimit:{name}:{address}", limit, window_ms)
+        if not allowed:
+            metrics.incr("rate_limit", name, "rejected")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Please try again later.",
+                headers={
+                    "Retry-After": str(max(1, -(-retry_after_ms // 1000))),
+                    "X-RateLimit-Limit": str(limit),
+                    "X-RateLimit-Remaining": "0",
+                },
+            )
+        metrics.incr("rate_limit", name, "allowed")
+        response.headers["X-RateLimit-Limit"] = str(limit)
+        response.headers["X-RateLimit-Remaining"] = str(remaining)
+
+    return dependency
@@ -1,29 +1,21 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
 from app.models.models import User
 from app.database import get_db
+from app.cache import build_cache_key, get_or_set, CACHE_TTL
+from app.core.passwords import pwd_context, hash_password, verify_password  # noqa: F401
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
-def hash_password(password: str) -> str:
-    """Hash a password."""
-    return pwd_context.hash(password)
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
-
-
 def create_access_token(
     data: dict,
     expires_delta: Optional[timedelta] = None
@@ -48,44 +40,94 @@ def create_access_token(
     return encoded_jwt
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get the current authenticated user from JWT token."""
-    settings = get_settings()
-    credentials_exception = HTTPException(
+@dataclass(frozen=True)
+class Principal:
+    """What authorization needs to know about the caller."""
+    id: int
+    username: str
+    is_admin: bool
+    is_active: bool
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+
+def _token_username(token: str) -> str:
+    """The username (``sub``) of a valid token."""
+    settings = get_settings()
     try:
         payload = jwt.decode(
             token,
             settings.SECRET_KEY,
             algorithms=[settings.ALGORITHM]
         )
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
+        raise _credentials_exception()
+    username: str = payload.get("sub")
+    if username is None:
+        raise _credentials_exception()
+    return username
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """Get the current authenticated user from JWT token."""
+    username = _token_username(token)
     
-    user = db.query(User).filter(User.username == username).first()
+    user = await db.scalar(select(User).where(User.username == username).limit(1))
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
     return user
 
 
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
+    """
+    Get the caller's id and flags, cached per username.
+
+    Parallel admin calls share one cached lookup instead of querying the
+    users table each; ``routers/users.py`` invalidates the ``principals``
+    namespace whenever a user changes, and the short TTL bounds staleness.
+    """
+    username = _token_username(token)
+
+    async def load():
+        user = await db.scalar(select(User).where(User.username == username).limit(1))
+        if user is None:
+            raise _credentials_exception()
+        return {
+            "id": user.id,
+            "username": user.username,
+            "is_admin": user.is_admin,
+            "is_active": user.is_active,
+        }
+
+    key = await build_cache_key('principals', username)
+    return Principal(**await get_or_set(key, load, ttl=CACHE_TTL['principals']))
+
+
 def require_admin(
-    current_user: User = Depends(get_current_user)
-) -> User:
-    """Dependency to require admin role."""
-    if not current_user.is_admin:
+    principal: Principal = Depends(get_current_principal)
+) -> Principal:
+    """Dependency to require an active admin."""
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is disabled"
+        )
+    if not principal.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required"
         )
-    return current_user
+    return principal
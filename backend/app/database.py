@@ -1,16 +1,57 @@
+from pathlib import Path
+from typing import AsyncIterator, Callable, Optional
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
 from app.core.config import get_settings
+from app.cache import written_recently
+from app.core.query_stats import instrument_engine
 
 settings = get_settings()
 
-# Create database engine
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Async drivers for the sync URLs accepted in DATABASE_URL
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(database_url: Optional[str] = None) -> str:
+    """
+    ``database_url`` (default: ASYNC_DATABASE_URL, else DATABASE_URL)
+    switched to its async driver.
+    """
+    if database_url is None:
+        if settings.ASYNC_DATABASE_URL:
+            return settings.ASYNC_DATABASE_URL
+        database_url = settings.DATABASE_URL
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def _pool_options(url: str) -> dict:
+    # SQLite uses a single-connection pool that does not accept sizing
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+    }
+
+
+# Create database engine (sync: scripts, seeders and migrations)
 engine = create_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
     pool_pre_ping=True,  # Verify connections before using them
-    pool_size=10,
-    max_overflow=20,
+    **_pool_options(settings.DATABASE_URL),
 )
 
 # Create session factory
@@ -20,11 +61,84 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Async engine used by the API
+async_engine = create_async_engine(
+    get_async_database_url(),
+    echo=settings.DEBUG,
+    pool_pre_ping=True,
+    **_pool_options(get_async_database_url()),
+)
+
+# Objects stay loaded after commit so responses can be built without
+# another round trip (lazy refresh is not possible in async code)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# Read replica for public endpoints; the primary when none is configured
+if settings.DATABASE_REPLICA_URL:
+    replica_url = get_async_database_url(settings.DATABASE_REPLICA_URL)
+    replica_engine = create_async_engine(
+        replica_url,
+        echo=settings.DEBUG,
+        pool_pre_ping=True,
+        **_pool_options(replica_url),
+    )
+    ReplicaSessionLocal = async_sessionmaker(
+        bind=replica_engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+else:
+    replica_engine = async_engine
+    ReplicaSessionLocal = AsyncSessionLocal
 
-def get_db() -> Session:
-    """Get database session dependency."""
-    db = SessionLocal()
-    try:
+# Per-request query counts / timings and the slow-query log
+for _engine in {engine, async_engine.sync_engine, replica_engine.sync_engine}:
+    instrument_engine(_engine)
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """Get database session dependency (primary: writes and admin reads)."""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+def get_read_db(namespace: str) -> Callable[[], AsyncIterator[AsyncSession]]:
+    """
+    Session dependency for public reads of a cache namespace.
+
+    Uses the read replica, except for DATABASE_REPLICA_MAX_LAG seconds
+    after a write to the namespace: cache entries are re-filled right
+    after a write, and a lagging replica would put stale rows back into
+    the cache.
+    """
+    async def get_read_session() -> AsyncIterator[AsyncSession]:
+        session_factory = ReplicaSessionLocal
+        if written_recently(namespace, settings.DATABASE_REPLICA_MAX_LAG):
+            session_factory = AsyncSessionLocal
+        async with session_factory() as db:
+            yield db
+
+    return get_read_session
+
+
+# Flush hooks keeping article_tags and tag counts in sync with Article.tags
+from app.services import article_tags  # noqa: E402,F401
+
+
+def run_migrations(revision: str = "head"):
+    """
+    Apply Alembic migrations (same as ``alembic upgrade head``).
+
+    The schema is managed by migrations only; the API never creates
+    tables on startup.
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    command.upgrade(config, revision)
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, Index, JSON
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, query_expression
 from datetime import datetime
 
 Base = declarative_base()
@@ -46,6 +46,7 @@ class TeamMember(Base):
     email = Column(String(255), nullable=True, index=True)
     phone = Column(String(20), nullable=True)
     image_url = Column(String(500), nullable=True)
+    image_variants = Column(JSON, nullable=True)  # resized copies of image_url, filled in the background
     bio_en = Column(Text, nullable=True)
     bio_fa = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -60,6 +61,7 @@ class Certificate(Base):
     title_en = Column(String(255), nullable=False)
     title_fa = Column(String(255), nullable=True)
     image_url = Column(String(500), nullable=True)
+    image_variants = Column(JSON, nullable=True)  # resized copies of image_url, filled in the background
     description_en = Column(Text, nullable=True)
     description_fa = Column(Text, nullable=True)
     issue_date = Column(String(50), nullable=True)
@@ -76,6 +78,7 @@ class License(Base):
     title_en = Column(String(255), nullable=False)
     title_fa = Column(String(255), nullable=True)
     image_url = Column(String(500), nullable=True)
+    image_variants = Column(JSON, nullable=True)  # resized copies of image_url, filled in the background
     description_en = Column(Text, nullable=True)
     description_fa = Column(Text, nullable=True)
     issue_date = Column(String(50), nullable=True)
@@ -139,6 +142,7 @@ class Project(Base):
     description_en = Column(Text, nullable=False)
     description_fa = Column(Text, nullable=True)
     image_url = Column(String(500), nullable=True)
+    image_variants = Column(JSON, nullable=True)  # resized copies of image_url, filled in the background
     archive_url = Column(String(500), nullable=True)
     iframe_url = Column(String(500), nullable=True)
     category = Column(String(50), nullable=True, index=True)  # e.g., "BIM", "Surveying"
@@ -146,6 +150,10 @@ class Project(Base):
     is_featured = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Card excerpts of description_en/_fa, only set by list queries (with_expression)
+    excerpt_en = query_expression()
+    excerpt_fa = query_expression()
 
 
 class Article(Base):
@@ -161,10 +169,54 @@ class Article(Base):
     content_en = Column(Text, nullable=False)
     content_fa = Column(Text, nullable=True)
     image_url = Column(String(500), nullable=True)
-    tags = Column(String(500), nullable=True)  # Comma-separated tags
+    tags = Column(String(500), nullable=True)  # Comma-separated tags (as entered; indexed in article_tags)
     category = Column(String(100), nullable=True, index=True)
     author = Column(String(255), nullable=True)
     is_published = Column(Boolean, default=True, index=True)
     publish_date = Column(DateTime, default=datetime.utcnow, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+
+class Tag(Base):
+    """Article tag, with the number of published articles using it."""
+    __tablename__ = "tags"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), unique=True, nullable=False, index=True)
+    article_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class ArticleTag(Base):
+    """Association between articles and tags (kept in sync with Article.tags)."""
+    __tablename__ = "article_tags"
+    
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+    
+    __table_args__ = (
+        # Tag filter: tag -> articles (the primary key covers article -> tags)
+        Index("ix_article_tags_tag_id_article_id", "tag_id", "article_id"),
+    )
+
+# Composite indexes matching the hot list queries (created by migration
+# 0002). Partial ones only cover published articles, the only rows the
+# public endpoints read.
+Index(
+    "ix_articles_published_publish_date",
+    Article.publish_date, Article.id,
+    postgresql_where=Article.is_published == True,
+    sqlite_where=Article.is_published == True,
+)
+Index(
+    "ix_articles_published_category",
+    Article.category, Article.publish_date, Article.id,
+    postgresql_where=Article.is_published == True,
+    sqlite_where=Article.is_published == True,
+)
+Index("ix_projects_order_created_at", Project.order, Project.created_at.desc())
+Index("ix_projects_category_order", Project.category, Project.order, Project.created_at.desc())
+Index("ix_services_category_created_at", Service.category, Service.created_at)
+Index("ix_contact_submissions_status_submitted_at", ContactSubmission.status, ContactSubmission.submitted_at, ContactSubmission.id)
+Index("ix_contact_submissions_submitted_at_id", ContactSubmission.submitted_at, ContactSubmission.id)
@@ -1,83 +1,114 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import select, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
+from typing import List, Union
 
-from app.database import get_db
-from app.models.models import Article
-from app.schemas.schemas import ArticleCreate, ArticleUpdate, ArticleResponse
+from app.database import get_db, get_read_db
+from app.models.models import Article, ArticleTag, Tag
+from app.schemas.schemas import (
+    ArticleCreate, ArticleUpdate, ArticleResponse, ArticleSummary, CursorPage, TagCountResponse,
+    ArticleSearchResponse, BatchCreate, BatchUpdate, BatchDelete, ArticleBatchUpdateItem
+)
 from app.core.security import require_admin
+from app.services.batch import create_many, update_many, delete_many
+from app.services import article_tags
+from app.core.pagination import keyset_page
+from app.services import article_search
 from app.cache import (
-    get_cached, set_cache, delete_cache, invalidate_pattern,
-    CACHE_KEYS, CACHE_TTL
+    cached_endpoint, invalidate_namespace,
+    CACHE_TTL
 )
 
 router = APIRouter(prefix="/articles", tags=["Articles"])
 
 
-@router.get("", response_model=List[ArticleResponse])
+@router.get("", response_model=Union[List[ArticleSummary], CursorPage[ArticleSummary]])
+@cached_endpoint('articles', Union[List[ArticleSummary], CursorPage[ArticleSummary]], ttl=CACHE_TTL['articles'])
 async def get_articles(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     tag: str = Query(None, description="Filter by tag"),
     category: str = Query(None, description="Filter by category"),
-    db: Session = Depends(get_db)
+    cursor: str = Query(None, description="Keyset pagination: empty for the first page, then next_cursor/prev_cursor"),
+    db: AsyncSession = Depends(get_read_db('articles'))
 ):
-    """Get articles with pagination and optional filtering."""
+    """
+    Get articles with pagination and optional filtering.
+
+    Without ``cursor`` this returns a plain list paged by ``skip``; with
+    it, a page of ``items`` ordered by (publish_date, id) plus cursors for
+    the neighbouring pages, which stay as cheap as the first one. The
+    content columns are not loaded; only the detail endpoint returns them.
+    """
     # Query database
-    query = db.query(Article).filter(Article.is_published == True).order_by(Article.publish_date.desc())
+    query = select(Article).options(
+        defer(Article.content_en), defer(Article.content_fa)
+    ).where(Article.is_published == True)
     
     if tag:
-        query = query.filter(Article.tags.contains(tag))
+        query = query.where(Article.id.in_(
+            select(ArticleTag.article_id).join(Tag, Tag.id == ArticleTag.tag_id).where(Tag.name == tag.strip())
+        ))
     if category:
-        query = query.filter(Article.category == category)
+        query = query.where(Article.category == category)
     
-    articles = query.offset(skip).limit(limit).all()
+    if cursor is not None:
+        return await keyset_page(db, query, [Article.publish_date, Article.id], cursor, limit)
     
-    return articles
+    query = query.order_by(Article.publish_date.desc())
+    return (await db.scalars(query.offset(skip).limit(limit))).all()
+
+
+@router.get("/search", response_model=ArticleSearchResponse)
+@cached_endpoint('articles', ArticleSearchResponse, ttl=CACHE_TTL['articles'])
+async def search_articles(
+    q: str = Query(..., min_length=1, max_length=200, description="Search text (English or Persian)"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db('articles'))
+):
+    """
+    Full-text search over published articles (titles, summaries, content).
+
+    Results are ranked by relevance; the last word matches as a prefix, so
+    this can back search-as-you-type.
+    """
+    return await article_search.search_articles(db, q, skip, limit)
 
 
 @router.get("/{article_id_or_slug}", response_model=ArticleResponse)
+@cached_endpoint('articles', ArticleResponse, ttl=CACHE_TTL['articles'])
 async def get_article(
     article_id_or_slug: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db('articles'))
 ):
     """Get a specific article by ID or slug."""
-    # Try cache
-    cache_key = f"{CACHE_KEYS['articles']}:{article_id_or_slug}"
-    cached_data = await get_cached(cache_key)
-    if cached_data:
-        return cached_data
-    
-    # Try to get by ID first (if numeric)
-    article = None
+    # One query: a numeric value matches by ID first, then by slug
+    query = select(Article).where(Article.slug == article_id_or_slug)
     if article_id_or_slug.isdigit():
-        article = db.query(Article).filter(Article.id == int(article_id_or_slug)).first()
-    
-    # If not found by ID, try by slug
-    if not article:
-        article = db.query(Article).filter(Article.slug == article_id_or_slug).first()
+        article_id = int(article_id_or_slug)
+        query = (
+            select(Article)
+            .where(or_(Article.id == article_id, Article.slug == article_id_or_slug))
+            .order_by((Article.id == article_id).desc())
+        )
+    article = await db.scalar(query.limit(1))
     
     if not article:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
     
-    # Cache result
-    await set_cache(
-        cache_key,
-        ArticleResponse.from_orm(article).dict(),
-        ttl=CACHE_TTL['articles']
-    )
-    
     return article
 
 
 @router.post("", response_model=ArticleResponse, dependencies=[Depends(require_admin)])
 async def create_article(
     article: ArticleCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new article (admin only)."""
     # Check for duplicate slug
-    existing = db.query(Article).filter(Article.slug == article.slug).first()
+    existing = await db.scalar(select(Article).where(Article.slug == article.slug).limit(1))
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -86,23 +117,105 @@ async def create_article(
     
     db_article = Article(**article.dict())
     db.add(db_article)
-    db.commit()
-    db.refresh(db_article)
+    await db.commit()
+    await db.refresh(db_article)
     
     # Invalidate cache
-    await invalidate_pattern(CACHE_KEYS['articles'])
+    await invalidate_namespace('articles')
     
     return db_article
 
 
+async def _check_batch_slugs(db: AsyncSession, rows: List[dict]):
+    """400 if two rows share a slug or a slug belongs to another article."""
+    slugs = [row["slug"] for row in rows if "slug" in row]
+    if len(slugs) != len(set(slugs)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duplicate slugs in batch"
+        )
+    if not slugs:
+        return
+    owners = dict((await db.execute(select(Article.slug, Article.id).where(Article.slug.in_(slugs)))).all())
+    taken = [
+        row["slug"] for row in rows
+        if "slug" in row and owners.get(row["slug"], row.get("id")) != row.get("id")
+    ]
+    if taken:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Articles with these slugs already exist: {taken}"
+        )
+
+
+@router.post("/batch", response_model=List[ArticleResponse], status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_admin)])
+async def create_articles_batch(
+    batch: BatchCreate[ArticleCreate],
+    db: AsyncSession = Depends(get_db)
+):
+    """Create several articles in one transaction (admin only)."""
+    rows = [item.dict() for item in batch.items]
+    await _check_batch_slugs(db, rows)
+    articles = await create_many(db, Article, rows)
+    
+    # Bulk inserts skip the flush hooks that maintain article_tags
+    ids = [a.id for a in articles]
+    await db.run_sync(lambda session: article_tags.resync_articles(session.connection(), ids))
+    await db.commit()
+    
+    # Invalidate cache once for the whole batch
+    await invalidate_namespace('articles')
+    
+    return articles
+
+
+@router.put("/batch", response_model=List[ArticleResponse], dependencies=[Depends(require_admin)])
+async def update_articles_batch(
+    batch: BatchUpdate[ArticleBatchUpdateItem],
+    db: AsyncSession = Depends(get_db)
+):
+    """Update several articles in one transaction (admin only)."""
+    rows = [item.dict(exclude_unset=True) for item in batch.items]
+    await _check_batch_slugs(db, rows)
+    articles = await update_many(db, Article, rows)
+    
+    # Bulk updates skip the flush hooks that maintain article_tags
+    ids = [row["id"] for row in rows if "tags" in row or "is_published" in row]
+    if ids:
+        await db.run_sync(lambda session: article_tags.resync_articles(session.connection(), ids))
+    await db.commit()
+    
+    # Invalidate cache once for the whole batch
+    await invalidate_namespace('articles')
+    
+    return articles
+
+
+@router.post("/batch/delete", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(require_admin)])
+async def delete_articles_batch(
+    batch: BatchDelete,
+    db: AsyncSession = Depends(get_db)
+):
+    """Delete several articles in one transaction (admin only)."""
+    # Bulk deletes skip the flush hooks that maintain article_tags
+    await db.run_sync(lambda session: article_tags.drop_articles(session.connection(), batch.ids))
+    await delete_many(db, Article, batch.ids)
+    await db.commit()
+    
+    # Invalidate cache once for the whole batch
+    await invalidate_namespace('articles')
+    
+    return None
+
+
 @router.put("/{article_id}", response_model=ArticleResponse, dependencies=[Depends(require_admin)])
 async def update_article(
     article_id: int,
     article: ArticleUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update an article (admin only)."""
-    db_article = db.query(Article).filter(Article.id == article_id).first()
+    db_article = await db.scalar(select(Article).where(Article.id == article_id).limit(1))
     if not db_article:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
     
@@ -110,10 +223,10 @@ async def update_article(
     
     # Check for duplicate slug if slug is being updated
     if 'slug' in update_data and update_data['slug'] != db_article.slug:
-        existing = db.query(Article).filter(
+        existing = await db.scalar(select(Article).where(
             Article.slug == update_data['slug'],
             Article.id != article_id
-        ).first()
+        ).limit(1))
         if existing:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -124,11 +237,11 @@ async def update_article(
         setattr(db_article, field, value)
     
     db.add(db_article)
-    db.commit()
-    db.refresh(db_article)
+    await db.commit()
+    await db.refresh(db_article)
     
     # Invalidate cache
-    await invalidate_pattern(CACHE_KEYS['articles'])
+    await invalidate_namespace('articles')
     
     return db_article
 
@@ -136,43 +249,49 @@ async def update_article(
 @router.delete("/{article_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(require_admin)])
 async def delete_article(
     article_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete an article (admin only)."""
-    db_article = db.query(Article).filter(Article.id == article_id).first()
+    db_article = await db.scalar(select(Article).where(Article.id == article_id).limit(1))
     if not db_article:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
     
-    db.delete(db_article)
-    db.commit()
+    await db.delete(db_article)
+    await db.commit()
     
     # Invalidate cache
-    await invalidate_pattern(CACHE_KEYS['articles'])
+    await invalidate_namespace('articles')
     
     return None
 
 
 @router.get("/tags/all", response_model=List[str])
-async def get_all_tags(db: Session = Depends(get_db)):
+@cached_endpoint('articles', List[str], ttl=CACHE_TTL['articles'])
+async def get_all_tags(db: AsyncSession = Depends(get_read_db('articles'))):
     """Get all unique tags from published articles."""
-    articles = db.query(Article).filter(Article.is_published == True).all()
-    tags_set = set()
-    
-    for article in articles:
-        if article.tags:
-            tags = [tag.strip() for tag in article.tags.split(',')]
-            tags_set.update(tags)
-    
-    return sorted(list(tags_set))
+    return (await db.scalars(
+        select(Tag.name).where(Tag.article_count > 0).order_by(Tag.name)
+    )).all()
+
+
+@router.get("/tags/counts", response_model=List[TagCountResponse])
+@cached_endpoint('articles', List[TagCountResponse], ttl=CACHE_TTL['articles'])
+async def get_tag_counts(db: AsyncSession = Depends(get_read_db('articles'))):
+    """Get tags of published articles with how many articles use each."""
+    return (await db.execute(
+        select(Tag.name, Tag.article_count.label("count"))
+        .where(Tag.article_count > 0)
+        .order_by(Tag.article_count.desc(), Tag.name)
+    )).all()
 
 
 @router.post("/seed-demo", response_model=dict)
-async def seed_demo_articles(db: Session = Depends(get_db)):
+async def seed_demo_articles(db: AsyncSession = Depends(get_db)):
     """Seed demo articles for development. (Development only)"""
     from datetime import datetime, timedelta
     
     # Check if articles already exist
-    existing = db.query(Article).count()
+    existing = await db.scalar(select(func.count()).select_from(Article))
     if existing > 0:
         return {"message": f"Articles already exist: {existing} articles found"}
     
@@ -250,7 +369,10 @@ async def seed_demo_articles(db: Session = Depends(get_db)):
     ]
     
     db.add_all(sample_articles)
-    db.commit()
+    await db.commit()
+    
+    # Invalidate cache
+    await invalidate_namespace('articles')
     
     return {
         "message": f"Successfully seeded {len(sample_articles)} demo articles",
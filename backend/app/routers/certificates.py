@@ -1,57 +1,44 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-import os
-import shutil
 from datetime import datetime
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.models import Certificate
 from app.schemas.schemas import (
-    CertificateCreate, CertificateUpdate, CertificateResponse
+    CertificateCreate, CertificateUpdate, CertificateResponse,
+    BatchCreate, BatchUpdate, BatchDelete, CertificateBatchUpdateItem
 )
 from app.core.security import require_admin
+from app.services import image_derivatives
+from app.services.batch import create_many, update_many, delete_many
+from app.services.uploads import save_image
 from app.cache import (
-    get_cached, set_cache, delete_cache, invalidate_pattern,
-    CACHE_KEYS, CACHE_TTL
+    cached_endpoint, invalidate_namespace,
+    CACHE_TTL
 )
 
 router = APIRouter(prefix="/certificates", tags=["Certificates"])
 
-UPLOAD_DIR = "/home/unique/projects/geobiro/backend/uploads/certificates"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
 
 @router.get("", response_model=List[CertificateResponse])
+@cached_endpoint('certificates', List[CertificateResponse], ttl=CACHE_TTL['certificates'])
 async def get_certificates(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db('certificates'))
 ):
     """Get all certificates."""
-    # Try to get from cache
-    cache_key = CACHE_KEYS['certificates']
-    cached_data = await get_cached(cache_key)
-    if cached_data:
-        return cached_data
-    
-    certificates = db.query(Certificate).order_by(Certificate.created_at.desc()).all()
-    
-    # Cache result
-    await set_cache(
-        cache_key,
-        [CertificateResponse.from_orm(c).dict() for c in certificates],
-        ttl=CACHE_TTL['certificates']
-    )
-    
-    return certificates
+    return (await db.scalars(select(Certificate).order_by(Certificate.created_at.desc()))).all()
 
 
 @router.get("/{cert_id}", response_model=CertificateResponse)
+@cached_endpoint('certificates', CertificateResponse, ttl=CACHE_TTL['certificates'])
 async def get_certificate(
     cert_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db('certificates'))
 ):
     """Get a specific certificate."""
-    certificate = db.query(Certificate).filter(Certificate.id == cert_id).first()
+    certificate = await db.scalar(select(Certificate).where(Certificate.id == cert_id).limit(1))
     if not certificate:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -63,17 +50,17 @@ async def get_certificate(
 @router.post("", response_model=CertificateResponse, status_code=status.HTTP_201_CREATED)
 async def create_certificate(
     cert_data: CertificateCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: object = Depends(require_admin)
 ):
     """Create a new certificate (admin only)."""
     new_cert = Certificate(**cert_data.dict())
     db.add(new_cert)
-    db.commit()
-    db.refresh(new_cert)
+    await db.commit()
+    await db.refresh(new_cert)
     
     # Invalidate cache
-    await delete_cache(CACHE_KEYS['certificates'])
+    await invalidate_namespace('certificates')
     
     return new_cert
 
@@ -82,42 +69,29 @@ async def create_certificate(
 async def upload_certificate_image(
     cert_id: int,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: object = Depends(require_admin)
 ):
     """Upload image for certificate."""
-    certificate = db.query(Certificate).filter(Certificate.id == cert_id).first()
+    certificate = await db.scalar(select(Certificate).where(Certificate.id == cert_id).limit(1))
     if not certificate:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Certificate not found"
         )
     
-    # Validate file type
-    allowed_extensions = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
-    file_ext = os.path.splitext(file.filename)[1].lower()
-    if file_ext not in allowed_extensions:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid file type"
-        )
-    
-    # Save file
+    # Validate and store the image (streamed, size-limited, type from content)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"cert_{cert_id}_{timestamp}{file_ext}"
-    filepath = os.path.join(UPLOAD_DIR, filename)
-    
-    with open(filepath, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    stored = await save_image(file, "certificates", f"cert_{cert_id}_{timestamp}")
     
     # Update certificate with image URL
-    image_url = f"/uploads/certificates/{filename}"
+    image_url = stored.url
     certificate.image_url = image_url
-    db.commit()
-    db.refresh(certificate)
+    await db.commit()
+    await db.refresh(certificate)
     
     # Invalidate cache
-    await delete_cache(CACHE_KEYS['certificates'])
+    await invalidate_namespace('certificates')
     
     return {
         "success": True,
@@ -126,15 +100,72 @@ async def upload_certificate_image(
     }
 
 
+@router.post("/batch", response_model=List[CertificateResponse], status_code=status.HTTP_201_CREATED)
+async def create_certificates_batch(
+    batch: BatchCreate[CertificateCreate],
+    db: AsyncSession = Depends(get_db),
+    admin: object = Depends(require_admin)
+):
+    """Create several certificates in one transaction (admin only)."""
+    rows = [item.dict() for item in batch.items]
+    certificates = await create_many(db, Certificate, rows)
+    await db.commit()
+    # Bulk statements bypass the session hooks that queue image derivatives
+    image_derivatives.schedule(Certificate, [certificate.id for certificate in certificates])
+    
+    # Invalidate cache once for the whole batch
+    await invalidate_namespace('certificates')
+    
+    return certificates
+
+
+@router.put("/batch", response_model=List[CertificateResponse])
+async def update_certificates_batch(
+    batch: BatchUpdate[CertificateBatchUpdateItem],
+    db: AsyncSession = Depends(get_db),
+    admin: object = Depends(require_admin)
+):
+    """Update several certificates in one transaction (admin only)."""
+    rows = [item.dict(exclude_unset=True) for item in batch.items]
+    certificates = await update_many(db, Certificate, rows)
+    await db.commit()
+    # Bulk statements bypass the session hooks that queue image derivatives
+    image_derivatives.schedule(Certificate, [certificate.id for certificate in certificates])
+    
+    # Invalidate cache once for the whole batch
+    await invalidate_namespace('certificates')
+    
+    return certificates
+
+
+@router.post("/batch/delete", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_certificates_batch(
+    batch: BatchDelete,
+    db: AsyncSession = Depends(get_db),
+    admin: object = Depends(require_admin)
+):
+    """Delete several certificates in one transaction (admin only)."""
+    variants = await image_derivatives.load_variants(db, Certificate, batch.ids)
+    await delete_many(db, Certificate, batch.ids)
+    await db.commit()
+    # Bulk statements bypass the session hooks that remove image derivatives
+    image_derivatives.discard(variants)
+    
+    # Invalidate cache once for the whole batch
+    await invalidate_namespace('certificates')
+    
+    return None
+
+
 @router.put("/{cert_id}", response_model=CertificateResponse)
 async def update_certificate(
     cert_id: int,
     cert_data: CertificateUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: object = Depends(require_admin)
 ):
     """Update a certificate (admin only)."""
-    certificate = db.query(Certificate).filter(Certificate.id == cert_id).first()
+    certificate = await db.scalar(select(Certificate).where(Certificate.id == cert_id).limit(1))
     if not certificate:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -145,11 +176,11 @@ async def update_certificate(
     for field, value in update_data.items():
         setattr(certificate, field, value)
     
-    db.commit()
-    db.refresh(certificate)
+    await db.commit()
+    await db.refresh(certificate)
     
     # Invalidate cache
-    await delete_cache(CACHE_KEYS['certificates'])
+    await invalidate_namespace('certificates')
     
     return certificate
 
@@ -157,19 +188,19 @@ async def update_certificate(
 @router.delete("/{cert_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_certificate(
     cert_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: object = Depends(require_admin)
 ):
     """Delete a certificate (admin only)."""
-    certificate = db.query(Certificate).filter(Certificate.id == cert_id).first()
+    certificate = await db.scalar(select(Certificate).where(Certificate.id == cert_id).limit(1))
     if not certificate:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Certificate not found"
         )
     
-    db.delete(certificate)
-    db.commit()
+    await db.delete(certificate)
+    await db.commit()
     
     # Invalidate cache
-    await delete_cache(CACHE_KEYS['certificates'])
+    await invalidate_namespace('certificates')
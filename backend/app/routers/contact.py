@@ -1,19 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Union
 
-from app.database import get_db
+from app.database import AsyncSessionLocal, get_db, get_read_db
 from app.models.models import ContactSubmission, CompanyInfo, Statistics
 from app.schemas.schemas import (
     ContactSubmissionCreate, ContactSubmissionResponse, ContactSubmissionDetail,
     CompanyInfoCreate, CompanyInfoUpdate, CompanyInfoResponse,
-    StatisticsUpdate, StatisticsResponse
+    StatisticsUpdate, StatisticsResponse, CursorPage
 )
 from app.core.security import require_admin
+from app.core.pagination import keyset_page
+from app.core.rate_limit import rate_limit, client_ip
 from app.services.email_service import send_contact_notification, send_contact_confirmation
 from app.cache import (
-    get_cached, set_cache, delete_cache,
-    CACHE_KEYS, CACHE_TTL
+    cached_endpoint, invalidate_namespace,
+    CACHE_TTL
 )
 
 router = APIRouter(tags=["Contact & Company"])
@@ -21,15 +24,20 @@ router = APIRouter(tags=["Contact & Company"])
 
 # ============ Contact Form Endpoints ============
 
-@router.post("/contact", response_model=ContactSubmissionResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/contact",
+    response_model=ContactSubmissionResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("contact"))]
+)
 async def submit_contact_form(
     contact_data: ContactSubmissionCreate,
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Submit a contact form (public endpoint)."""
     # Get client IP and user agent
-    client_ip = request.client.host if request.client else None
+    ip_address = client_ip(request)
     user_agent = request.headers.get("user-agent")
     
     # Create submission record
@@ -38,14 +46,14 @@ async def submit_contact_form(
         phone=contact_data.phone,
         email=contact_data.email,
         message=contact_data.message,
-        ip_address=client_ip,
+        ip_address=ip_address,
         user_agent=user_agent,
         status="new"
     )
     
     db.add(submission)
-    db.commit()
-    db.refresh(submission)
+    await db.commit()
+    await db.refresh(submission)
     
     # Send emails asynchronously
     try:
@@ -66,23 +74,37 @@ async def submit_contact_form(
     return submission
 
 
-@router.get("/admin/contact-submissions", response_model=List[ContactSubmissionDetail])
+@router.get(
+    "/admin/contact-submissions",
+    response_model=Union[List[ContactSubmissionDetail], CursorPage[ContactSubmissionDetail]]
+)
 async def get_contact_submissions(
     status_filter: str = None,
     limit: int = 50,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    cursor: str = None,
+    db: AsyncSession = Depends(get_db),
     admin: object = Depends(require_admin)
 ):
-    """Get all contact submissions (admin only)."""
-    query = db.query(ContactSubmission)
+    """
+    Get all contact submissions (admin only).
+
+    Pass ``cursor`` (empty for the first page) to page by
+    (submitted_at, id) instead of ``offset``.
+    """
+    query = select(ContactSubmission)
     
     if status_filter:
-        query = query.filter(ContactSubmission.status == status_filter)
+        query = query.where(ContactSubmission.status == status_filter)
+    
+    if cursor is not None:
+        return await keyset_page(
+            db, query, [ContactSubmission.submitted_at, ContactSubmission.id], cursor, limit
+        )
     
-    submissions = query.order_by(
+    submissions = (await db.scalars(query.order_by(
         ContactSubmission.submitted_at.desc()
-    ).offset(offset).limit(limit).all()
+    ).offset(offset).limit(limit))).all()
     
     return submissions
 
@@ -90,13 +112,13 @@ async def get_contact_submissions(
 @router.get("/admin/contact-submissions/{submission_id}", response_model=ContactSubmissionDetail)
 async def get_contact_submission(
     submission_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: object = Depends(require_admin)
 ):
     """Get a specific contact submission (admin only)."""
-    submission = db.query(ContactSubmission).filter(
+    submission = await db.scalar(select(ContactSubmission).where(
         ContactSubmission.id == submission_id
-    ).first()
+    ).limit(1))
     
     if not submission:
         raise HTTPException(
@@ -107,7 +129,7 @@ async def get_contact_submission(
     # Mark as read if status is new
     if submission.status == "new":
         submission.status = "read"
-        db.commit()
+        await db.commit()
     
     return submission
 
@@ -116,13 +138,13 @@ async def get_contact_submission(
 async def update_submission_status(
     submission_id: int,
     status_value: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: object = Depends(require_admin)
 ):
     """Update contact submission status (admin only)."""
-    submission = db.query(ContactSubmission).filter(
+    submission = await db.scalar(select(ContactSubmission).where(
         ContactSubmission.id == submission_id
-    ).first()
+    ).limit(1))
     
     if not submission:
         raise HTTPException(
@@ -137,8 +159,8 @@ async def update_submission_status(
         )
     
     submission.status = status_value
-    db.commit()
-    db.refresh(submission)
+    await db.commit()
+    await db.refresh(submission)
     
     return {"success": True, "submission": ContactSubmissionDetail.from_orm(submission)}
 
@@ -146,13 +168,13 @@ async def update_submission_status(
 @router.delete("/admin/contact-submissions/{submission_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_contact_submission(
     submission_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: object = Depends(require_admin)
 ):
     """Delete a contact submission (admin only)."""
-    submission = db.query(ContactSubmission).filter(
+    submission = await db.scalar(select(ContactSubmission).where(
         ContactSubmission.id == submission_id
-    ).first()
+    ).limit(1))
     
     if not submission:
         raise HTTPException(
@@ -160,48 +182,35 @@ async def delete_contact_submission(
             detail="Contact submission not found"
         )
     
-    db.delete(submission)
-    db.commit()
+    await db.delete(submission)
+    await db.commit()
 
 
 # ============ Company Info Endpoints ============
 
 @router.get("/company-info", response_model=CompanyInfoResponse)
+@cached_endpoint('company_info', CompanyInfoResponse, ttl=CACHE_TTL['company_info'])
 async def get_company_info(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db('company_info'))
 ):
     """Get company information."""
-    # Try to get from cache
-    cache_key = CACHE_KEYS['company_info']
-    cached_data = await get_cached(cache_key)
-    if cached_data:
-        return cached_data
-    
-    company = db.query(CompanyInfo).first()
+    company = await db.scalar(select(CompanyInfo).limit(1))
     if not company:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Company info not configured"
         )
-    
-    # Cache result
-    await set_cache(
-        cache_key,
-        CompanyInfoResponse.from_orm(company).dict(),
-        ttl=CACHE_TTL['company_info']
-    )
-    
     return company
 
 
 @router.put("/admin/company-info", response_model=CompanyInfoResponse)
 async def update_company_info(
     company_data: CompanyInfoUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: object = Depends(require_admin)
 ):
     """Update company information (admin only)."""
-    company = db.query(CompanyInfo).first()
+    company = await db.scalar(select(CompanyInfo).limit(1))
     
     if not company:
         # Create if doesn't exist
@@ -212,11 +221,11 @@ async def update_company_info(
     for field, value in update_data.items():
         setattr(company, field, value)
     
-    db.commit()
-    db.refresh(company)
+    await db.commit()
+    await db.refresh(company)
     
     # Invalidate cache
-    await delete_cache(CACHE_KEYS['company_info'])
+    await invalidate_namespace('company_info')
     
     return company
 
@@ -224,47 +233,44 @@ async def update_company_info(
 # ============ Statistics Endpoints ============
 
 @router.get("/statistics", response_model=StatisticsResponse)
+@cached_endpoint('statistics', StatisticsResponse, ttl=CACHE_TTL['statistics'])
 async def get_statistics(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db('statistics'))
 ):
     """Get statistics."""
-    # Try to get from cache
-    cache_key = CACHE_KEYS['statistics']
-    cached_data = await get_cached(cache_key)
-    if cached_data:
-        return cached_data
-    
-    stats = db.query(Statistics).first()
+    stats = await db.scalar(select(Statistics).limit(1))
     if not stats:
-        # Create default stats if don't exist
-        stats = Statistics(
-            annual_projects=1000,
-            service_types=9,
-            employees=90,
-            satisfied_clients=100
-        )
-        db.add(stats)
-        db.commit()
-        db.refresh(stats)
-    
-    # Cache result
-    await set_cache(
-        cache_key,
-        StatisticsResponse.from_orm(stats).dict(),
-        ttl=CACHE_TTL['statistics']
-    )
+        stats = await _create_default_statistics()
     
     return stats
 
 
+async def _create_default_statistics() -> Statistics:
+    """Create the default statistics row on the primary (``db`` may be a read replica)."""
+    async with AsyncSessionLocal() as db:
+        # The replica may just lag behind a row the primary already has
+        stats = await db.scalar(select(Statistics).limit(1))
+        if not stats:
+            stats = Statistics(
+                annual_projects=1000,
+                service_types=9,
+                employees=90,
+                satisfied_clients=100
+            )
+            db.add(stats)
+            await db.commit()
+            await db.refresh(stats)
+        return stats
+
+
 @router.put("/admin/statistics", response_model=StatisticsResponse)
 async def update_statistics(
     stats_data: StatisticsUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: object = Depends(require_admin)
 ):
     """Update statistics (admin only)."""
-    stats = db.query(Statistics).first()
+    stats = await db.scalar(select(Statistics).limit(1))
     
     if not stats:
         stats = Statistics()
@@ -274,10 +280,10 @@ async def update_statistics(
     for field, value in update_data.items():
         setattr(stats, field, value)
     
-    db.commit()
-    db.refresh(stats)
+    await db.commit()
+    await db.refresh(stats)
     
     # Invalidate cache
-    await delete_cache(CACHE_KEYS['statistics'])
+    await invalidate_namespace('statistics')
     
     return stats
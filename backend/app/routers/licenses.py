@@ -1,57 +1,44 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-import os
-import shutil
 from datetime import datetime
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.models import License
 from app.schemas.schemas import (
-    LicenseCreate, LicenseUpdate, LicenseResponse
+    LicenseCreate, LicenseUpdate, LicenseResponse,
+    BatchCreate, BatchUpdate, BatchDelete, LicenseBatchUpdateItem
 )
 from app.core.security import require_admin
+from app.services import image_derivatives
+from app.services.batch import create_many, update_many, delete_many
+from app.services.uploads import save_image
 from app.cache import (
-    get_cached, set_cache, delete_cache,
-    CACHE_KEYS, CACHE_TTL
+    cached_endpoint, invalidate_namespace,
+    CACHE_TTL
 )
 
 router = APIRouter(prefix="/licenses", tags=["Licenses"])
 
-UPLOAD_DIR = "/home/unique/projects/geobiro/backend/uploads/licenses"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
 
 @router.get("", response_model=List[LicenseResponse])
+@cached_endpoint('licenses', List[LicenseResponse], ttl=CACHE_TTL['licenses'])
 async def get_licenses(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db('licenses'))
 ):
     """Get all licenses."""
-    # Try to get from cache
-    cache_key = CACHE_KEYS['licenses']
-    cached_data = await get_cached(cache_key)
-    if cached_data:
-        return cached_data
-    
-    licenses = db.query(License).order_by(License.created_at.desc()).all()
-    
-    # Cache result
-    await set_cache(
-        cache_key,
-        [LicenseResponse.from_orm(l).dict() for l in licenses],
-        ttl=CACHE_TTL['licenses']
-    )
-    
-    return licenses
+    return (await db.scalars(select(License).order_by(License.created_at.desc()))).all()
 
 
 @router.get("/{license_id}", response_model=LicenseResponse)
+@cached_endpoint('licenses', LicenseResponse, ttl=CACHE_TTL['licenses'])
 async def get_license(
     license_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db('licenses'))
 ):
     """Get a specific license."""
-    license = db.query(License).filter(License.id == license_id).first()
+    license = await db.scalar(select(License).where(License.id == license_id).limit(1))
     if not license:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -63,17 +50,17 @@ async def get_license(
 @router.post("", response_model=LicenseResponse, status_code=status.HTTP_201_CREATED)
 async def create_license(
     license_data: LicenseCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: object = Depends(require_admin)
 ):
     """Create a new license (admin only)."""
     new_license = License(**license_data.dict())
     db.add(new_license)
-    db.commit()
-    db.refresh(new_license)
+    await db.commit()
+    await db.refresh(new_license)
     
     # Invalidate cache
-    await delete_cache(CACHE_KEYS['licenses'])
+    await invalidate_namespace('licenses')
     
     return new_license
 
@@ -82,42 +69,29 @@ async def create_license(
 async def upload_license_image(
     license_id: int,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: object = Depends(require_admin)
 ):
     """Upload image for license."""
-    license = db.query(License).filter(License.id == license_id).first()
+    license = await db.scalar(select(License).where(License.id == license_id).limit(1))
     if not license:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="License not found"
         )
     
-    # Validate file type
-    allowed_extensions = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
-    file_ext = os.path.splitext(file.filename)[1].lower()
-    if file_ext not in allowed_extensions:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid file type"
-        )
-    
-    # Save file
+    # Validate and store the image (streamed, size-limited, type from content)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"license_{license_id}_{timestamp}{file_ext}"
-    filepath = os.path.join(UPLOAD_DIR, filename)
-    
-    with open(filepath, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    stored = await save_image(file, "licenses", f"license_{license_id}_{timestamp}")
     
     # Update license with image URL
-    image_url = f"/uploads/licenses/{filename}"
+    image_url = stored.url
     license.image_url = image_url
-    db.commit()
-    db.refresh(license)
+    await db.commit()
+    await db.refresh(license)
     
     # Invalidate cache
-    await delete_cache(CACHE_KEYS['licenses'])
+    await invalidate_namespace('licenses')
     
     return {
         "success": True,
@@ -126,15 +100,72 @@ async def upload_license_image(
     }
 
 
+@router.post("/batch", response_model=List[LicenseResponse], status_code=status.HTTP_201_CREATED)
+async def create_licenses_batch(
+    batch: BatchCreate[LicenseCreate],
+    db: AsyncSession = Depends(get_db),
+    admin: object = Depends(require_admin)
+):
+    """Create several licenses in one transaction (admin only)."""
+    rows = [item.dict() for item in batch.items]
+    licenses = await create_many(db, License, rows)
+    await db.commit()
+    # Bulk statements bypass the session hooks that queue image derivatives
+    image_derivatives.schedule(License, [license.id for license in licenses])
+    
+    # Invalidate cache once for the whole batch
+    await invalidate_namespace('licenses')
+    
+    return licenses
+
+
+@router.put("/batch", response_model=List[LicenseResponse])
+async def update_licenses_batch(
+    batch: BatchUpdate[LicenseBatchUpdateItem],
+    db: AsyncSession = Depends(get_db),
+    admin: object = Depends(require_admin)
+):
+    """Update several licenses in one transaction (admin only)."""
+    rows = [item.dict(exclude_unset=True) for item in batch.items]
+    licenses = await update_many(db, License, rows)
+    await db.commit()
+    # Bulk statements bypass the session hooks that queue image derivatives
+    image_derivatives.schedule(License, [license.id for license in licenses])
+    
+    # Invalidate cache once for the whole batch
+    await invalidate_namespace('licenses')
+    
+    return licenses
+
+
+@router.post("/batch/delete", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_licenses_batch(
+    batch: BatchDelete,
+    db: AsyncSession = Depends(get_db),
+    admin: object = Depends(require_admin)
+):
+    """Delete several licenses in one transaction (admin only)."""
+    variants = await image_derivatives.load_variants(db, License, batch.ids)
+    await delete_many(db, License, batch.ids)
+    await db.commit()
+    # Bulk statements bypass the session hooks that remove image derivatives
+    image_derivatives.discard(variants)
+    
+    # Invalidate cache once for the whole batch
+    await invalidate_namespace('licenses')
+    
+    return None
+
+
 @router.put("/{license_id}", response_model=LicenseResponse)
 async def update_license(
     license_id: int,
     license_data: LicenseUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: object = Depends(require_admin)
 ):
     """Update a license (admin only)."""
-    license = db.query(License).filter(License.id == license_id).first()
+    license = await db.scalar(select(License).where(License.id == license_id).limit(1))
     if not license:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -145,11 +176,11 @@ async def update_license(
     for field, value in update_data.items():
         setattr(license, field, value)
     
-    db.commit()
-    db.refresh(license)
+    await db.commit()
+    await db.refresh(license)
     
     # Invalidate cache
-    await delete_cache(CACHE_KEYS['licenses'])
+    await invalidate_namespace('licenses')
     
     return license
 
@@ -157,19 +188,19 @@ async def update_license(
 @router.delete("/{license_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_license(
     license_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: object = Depends(require_admin)
 ):
     """Delete a license (admin only)."""
-    license = db.query(License).filter(License.id == license_id).first()
+    license = await db.scalar(select(License).where(License.id == license_id).limit(1))
     if not license:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="License not found"
         )
     
-    db.delete(license)
-    db.commit()
+    await db.delete(license)
+    await db.commit()
     
     # Invalidate cache
-    await delete_cache(CACHE_KEYS['licenses'])
+    await invalidate_namespace('licenses')
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends
+from typing import Dict
+
+from app.core.security import require_admin
+from app.core.metrics import metrics, read_metrics
+from app import cache
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+def _summarize_cache(counters: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """Derive hit ratio, average latency and payload size per cache namespace."""
+    summary = {}
+    for namespace, values in counters.items():
+        hits = values.get("hits_l1", 0) + values.get("hits_redis", 0)
+        lookups = hits + values.get("misses", 0)
+        gets = values.get("gets", 0)
+        sets = values.get("sets", 0)
+        fills = values.get("fills", 0)
+        summary[namespace] = {
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            "l1_hit_ratio": round(values.get("hits_l1", 0) / lookups, 4) if lookups else None,
+            "avg_get_ms": round(values.get("get_seconds", 0) / gets * 1000, 3) if gets else None,
+            "avg_fill_ms": round(values.get("fill_seconds", 0) / fills * 1000, 3) if fills else None,
+            "avg_payload_bytes": round(values.get("bytes_written", 0) / sets) if sets else None,
+        }
+    return summary
+
+
+@router.get("", dependencies=[Depends(require_admin)])
+async def get_metrics():
+    """
+    Get application counters (admin only).
+
+    ``cluster`` sums every worker's counters as of their last flush to
+    Redis; ``worker`` holds this worker's live totals.
+    """
+    local = metrics.snapshot()
+    cluster = None
+    if cache.redis_client is not None:
+        try:
+            cluster = await read_metrics(cache.redis_client)
+        except Exception as e:
+            print(f"Metrics read error: {e}")
+
+    counters = cluster if cluster is not None else local
+    return {
+        "worker_id": cache.WORKER_ID,
+        "worker": local,
+        "cluster": cluster,
+        "cache_summary": _summarize_cache(counters.get("cache", {})),
+    }
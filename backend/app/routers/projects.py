@@ -1,111 +1,150 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.orm import defer, with_expression
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.models import Project
-from app.schemas.schemas import ProjectCreate, ProjectUpdate, ProjectResponse
+from app.schemas.schemas import (
+    ProjectCreate, ProjectUpdate, ProjectResponse, ProjectSummary,
+    BatchCreate, BatchUpdate, BatchDelete, ProjectBatchUpdateItem
+)
 from app.core.security import require_admin
+from app.services import image_derivatives
+from app.services.batch import create_many, update_many, delete_many
 from app.cache import (
-    get_cached, set_cache, delete_cache, invalidate_pattern,
-    CACHE_KEYS, CACHE_TTL
+    cached_endpoint, invalidate_namespace,
+    CACHE_TTL
 )
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
 
+# Characters of each description shown on project cards
+PROJECT_EXCERPT_LENGTH = 240
+
 
-@router.get("", response_model=List[ProjectResponse])
+@router.get("", response_model=List[ProjectSummary])
+@cached_endpoint('projects', List[ProjectSummary], ttl=CACHE_TTL['projects'])
 async def get_projects(
     category: str = Query(None, description="Filter by category"),
     featured: bool = Query(None, description="Filter by featured status"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db('projects'))
 ):
-    """Get all projects with optional filtering."""
-    # Build cache key
-    cache_key_parts = [CACHE_KEYS['projects']]
-    if category:
-        cache_key_parts.append(f"category:{category}")
-    if featured is not None:
-        cache_key_parts.append(f"featured:{featured}")
-    
-    cache_key = ":".join(cache_key_parts) if len(cache_key_parts) > 1 else CACHE_KEYS['projects']
-    
-    # Try to get from cache
-    cached_data = await get_cached(cache_key)
-    if cached_data:
-        return cached_data
-    
+    """
+    Get all projects with optional filtering.
+
+    List items carry excerpts cut by the database; the full descriptions
+    are never read here (see the detail endpoint).
+    """
     # Query database
-    query = db.query(Project).order_by(Project.order, Project.created_at.desc())
+    query = select(Project).options(
+        defer(Project.description_en),
+        defer(Project.description_fa),
+        with_expression(Project.excerpt_en, func.substr(Project.description_en, 1, PROJECT_EXCERPT_LENGTH)),
+        with_expression(Project.excerpt_fa, func.substr(Project.description_fa, 1, PROJECT_EXCERPT_LENGTH)),
+    ).order_by(Project.order, Project.created_at.desc())
     
     if category:
-        query = query.filter(Project.category == category)
+        query = query.where(Project.category == category)
     if featured is not None:
-        query = query.filter(Project.is_featured == featured)
+        query = query.where(Project.is_featured == featured)
     
-    projects = query.all()
-    
-    # Cache result
-    await set_cache(
-        cache_key,
-        [ProjectResponse.from_orm(p).dict() for p in projects],
-        ttl=CACHE_TTL['projects']
-    )
-    
-    return projects
+    return (await db.scalars(query)).all()
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
+@cached_endpoint('projects', ProjectResponse, ttl=CACHE_TTL['projects'])
 async def get_project(
     project_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db('projects'))
 ):
     """Get a specific project by ID."""
-    # Try cache
-    cache_key = f"{CACHE_KEYS['projects']}:{project_id}"
-    cached_data = await get_cached(cache_key)
-    if cached_data:
-        return cached_data
-    
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.scalar(select(Project).where(Project.id == project_id).limit(1))
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
-    
-    # Cache result
-    await set_cache(
-        cache_key,
-        ProjectResponse.from_orm(project).dict(),
-        ttl=CACHE_TTL['projects']
-    )
-    
     return project
 
 
 @router.post("", response_model=ProjectResponse, dependencies=[Depends(require_admin)])
 async def create_project(
     project: ProjectCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new project (admin only)."""
     db_project = Project(**project.dict())
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    await db.commit()
+    await db.refresh(db_project)
     
     # Invalidate cache
-    await invalidate_pattern(CACHE_KEYS['projects'])
+    await invalidate_namespace('projects')
     
     return db_project
 
 
+@router.post("/batch", response_model=List[ProjectResponse], status_code=status.HTTP_201_CREATED, dependencies=[Depends(require_admin)])
+async def create_projects_batch(
+    batch: BatchCreate[ProjectCreate],
+    db: AsyncSession = Depends(get_db)
+):
+    """Create several projects in one transaction (admin only)."""
+    rows = [item.dict() for item in batch.items]
+    projects = await create_many(db, Project, rows)
+    await db.commit()
+    # Bulk statements bypass the session hooks that queue image derivatives
+    image_derivatives.schedule(Project, [project.id for project in projects])
+    
+    # Invalidate cache once for the whole batch
+    await invalidate_namespace('projects')
+    
+    return projects
+
+
+@router.put("/batch", response_model=List[ProjectResponse], dependencies=[Depends(require_admin)])
+async def update_projects_batch(
+    batch: BatchUpdate[ProjectBatchUpdateItem],
+    db: AsyncSession = Depends(get_db)
+):
+    """Update several projects in one transaction (admin only)."""
+    rows = [item.dict(exclude_unset=True) for item in batch.items]
+    projects = await update_many(db, Project, rows)
+    await db.commit()
+    # Bulk statements bypass the session hooks that queue image derivatives
+    image_derivatives.schedule(Project, [project.id for project in projects])
+    
+    # Invalidate cache once for the whole batch
+    await invalidate_namespace('projects')
+    
+    return projects
+
+
+@router.post("/batch/delete", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(require_admin)])
+async def delete_projects_batch(
+    batch: BatchDelete,
+    db: AsyncSession = Depends(get_db)
+):
+    """Delete several projects in one transaction (admin only)."""
+    variants = await image_derivatives.load_variants(db, Project, batch.ids)
+    await delete_many(db, Project, batch.ids)
+    await db.commit()
+    # Bulk statements bypass the session hooks that remove image derivatives
+    image_derivatives.discard(variants)
+    
+    # Invalidate cache once for the whole batch
+    await invalidate_namespace('projects')
+    
+    return None
+
+
 @router.put("/{project_id}", response_model=ProjectResponse, dependencies=[Depends(require_admin)])
 async def update_project(
     project_id: int,
     project: ProjectUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update a project (admin only)."""
-    db_project = db.query(Project).filter(Project.id == project_id).first()
+    db_project = await db.scalar(select(Project).where(Project.id == project_id).limit(1))
     if not db_project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     
@@ -114,11 +153,11 @@ async def update_project(
         setattr(db_project, field, value)
     
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    await db.commit()
+    await db.refresh(db_project)
     
     # Invalidate cache
-    await invalidate_pattern(CACHE_KEYS['projects'])
+    await invalidate_namespace('projects')
     
     return db_project
 
@@ -126,17 +165,17 @@ async def update_project(
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(require_admin)])
 async def delete_project(
     project_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a project (admin only)."""
-    db_project = db.query(Project).filter(Project.id == project_id).first()
+    db_project = await db.scalar(select(Project).where(Project.id == project_id).limit(1))
     if not db_project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     
-    db.delete(db_project)
-    db.commit()
+    await db.delete(db_project)
+    await db.commit()
     
     # Invalidate cache
-    await invalidate_pattern(CACHE_KEYS['projects'])
+    await invalidate_namespace('projects')
     
     return None
@@ -1,81 +1,59 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.models import Service
-from app.schemas.schemas import ServiceCreate, ServiceUpdate, ServiceResponse
+from app.schemas.schemas import (
+    ServiceCreate, ServiceUpdate, ServiceResponse,
+    BatchCreate, BatchUpdate, BatchDelete, ServiceBatchUpdateItem
+)
 from app.core.security import require_admin
+from app.services.batch import create_many, update_many, delete_many
 from app.cache import (
-    get_cached, set_cache, delete_cache, invalidate_pattern,
-    CACHE_KEYS, CACHE_TTL
+    cached_endpoint, invalidate_namespace,
+    CACHE_TTL
 )
 
 router = APIRouter(prefix="/services", tags=["Services"])
 
 
 @router.get("", response_model=List[ServiceResponse])
+@cached_endpoint('services', List[ServiceResponse], ttl=CACHE_TTL['services'])
 async def get_services(
     category: str = Query(None, description="Filter by category: BIM or Surveying"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db('services'))
 ):
     """Get all services with optional category filter."""
-    # Try to get from cache
-    cache_key = f"{CACHE_KEYS['services']}:{category}" if category else CACHE_KEYS['services']
-    cached_data = await get_cached(cache_key)
-    if cached_data:
-        return cached_data
-    
     # Query database
-    query = db.query(Service)
+    query = select(Service)
     if category:
-        query = query.filter(Service.category == category)
-    
-    services = query.order_by(Service.created_at.desc()).all()
+        query = query.where(Service.category == category)
     
-    # Cache result
-    await set_cache(
-        cache_key,
-        [ServiceResponse.from_orm(s).dict() for s in services],
-        ttl=CACHE_TTL['services']
-    )
-    
-    return services
+    return (await db.scalars(query.order_by(Service.created_at.desc()))).all()
 
 
 @router.get("/{service_id}", response_model=ServiceResponse)
+@cached_endpoint('services', ServiceResponse, ttl=CACHE_TTL['services'])
 async def get_service(
     service_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db('services'))
 ):
     """Get a specific service by ID."""
-    # Try to get from cache
-    cache_key = CACHE_KEYS['service_detail'].format(id=service_id)
-    cached_data = await get_cached(cache_key)
-    if cached_data:
-        return cached_data
-    
-    service = db.query(Service).filter(Service.id == service_id).first()
+    service = await db.scalar(select(Service).where(Service.id == service_id).limit(1))
     if not service:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Service not found"
         )
-    
-    # Cache result
-    await set_cache(
-        cache_key,
-        ServiceResponse.from_orm(service).dict(),
-        ttl=CACHE_TTL['services']
-    )
-    
     return service
 
 
 @router.post("", response_model=ServiceResponse, status_code=status.HTTP_201_CREATED)
 async def create_service(
     service_data: ServiceCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: object = Depends(require_admin)
 ):
     """Create a new service (admin only)."""
@@ -88,24 +66,84 @@ async def create_service(
     
     new_service = Service(**service_data.dict())
     db.add(new_service)
-    db.commit()
-    db.refresh(new_service)
+    await db.commit()
+    await db.refresh(new_service)
     
     # Invalidate cache
-    await invalidate_pattern(CACHE_KEYS['services'] + "*")
+    await invalidate_namespace('services')
     
     return new_service
 
 
+@router.post("/batch", response_model=List[ServiceResponse], status_code=status.HTTP_201_CREATED)
+async def create_services_batch(
+    batch: BatchCreate[ServiceCreate],
+    db: AsyncSession = Depends(get_db),
+    admin: object = Depends(require_admin)
+):
+    """Create several services in one transaction (admin only)."""
+    rows = [item.dict() for item in batch.items]
+    if any(row.get("category", "BIM") not in ["BIM", "Surveying"] for row in rows):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Category must be 'BIM' or 'Surveying'"
+        )
+    services = await create_many(db, Service, rows)
+    await db.commit()
+    
+    # Invalidate cache once for the whole batch
+    await invalidate_namespace('services')
+    
+    return services
+
+
+@router.put("/batch", response_model=List[ServiceResponse])
+async def update_services_batch(
+    batch: BatchUpdate[ServiceBatchUpdateItem],
+    db: AsyncSession = Depends(get_db),
+    admin: object = Depends(require_admin)
+):
+    """Update several services in one transaction (admin only)."""
+    rows = [item.dict(exclude_unset=True) for item in batch.items]
+    if any(row.get("category", "BIM") not in ["BIM", "Surveying"] for row in rows):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Category must be 'BIM' or 'Surveying'"
+        )
+    services = await update_many(db, Service, rows)
+    await db.commit()
+    
+    # Invalidate cache once for the whole batch
+    await invalidate_namespace('services')
+    
+    return services
+
+
+@router.post("/batch/delete", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_services_batch(
+    batch: BatchDelete,
+    db: AsyncSession = Depends(get_db),
+    admin: object = Depends(require_admin)
+):
+    """Delete several services in one transaction (admin only)."""
+    await delete_many(db, Service, batch.ids)
+    await db.commit()
+    
+    # Invalidate cache once for the whole batch
+    await invalidate_namespace('services')
+    
+    return None
+
+
 @router.put("/{service_id}", response_model=ServiceResponse)
 async def update_service(
     service_id: int,
     service_data: ServiceUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: object = Depends(require_admin)
 ):
     """Update a service (admin only)."""
-    service = db.query(Service).filter(Service.id == service_id).first()
+    service = await db.scalar(select(Service).where(Service.id == service_id).limit(1))
     if not service:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -116,13 +154,11 @@ async def update_service(
     for field, value in update_data.items():
         setattr(service, field, value)
     
-    db.commit()
-    db.refresh(service)
+    await db.commit()
+    await db.refresh(service)
     
     # Invalidate cache
-    await invalidate_pattern(CACHE_KEYS['services'] + "*")
-    cache_key = CACHE_KEYS['service_detail'].format(id=service_id)
-    await delete_cache(cache_key)
+    await invalidate_namespace('services')
     
     return service
 
@@ -130,21 +166,19 @@ async def update_service(
 @router.delete("/{service_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_service(
     service_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: object = Depends(require_admin)
 ):
     """Delete a service (admin only)."""
-    service = db.query(Service).filter(Service.id == service_id).first()
+    service = await db.scalar(select(Service).where(Service.id == service_id).limit(1))
     if not service:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Service not found"
         )
     
-    db.delete(service)
-    db.commit()
+    await db.delete(service)
+    await db.commit()
     
     # Invalidate cache
-    await invalidate_pattern(CACHE_KEYS['services'] + "*")
-    cache_key = CACHE_KEYS['service_detail'].format(id=service_id)
-    await delete_cache(cache_key)
+    await invalidate_namespace('services')
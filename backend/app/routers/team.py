@@ -1,93 +1,71 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import defer
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-import os
-import shutil
 from datetime import datetime
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.models import TeamMember
 from app.schemas.schemas import (
-    TeamMemberCreate, TeamMemberUpdate, TeamMemberResponse
+    TeamMemberCreate, TeamMemberUpdate, TeamMemberResponse, TeamMemberSummary,
+    BatchCreate, BatchUpdate, BatchDelete, TeamMemberBatchUpdateItem
 )
 from app.core.security import require_admin
+from app.services import image_derivatives
+from app.services.batch import create_many, update_many, delete_many
+from app.services.uploads import save_image
 from app.cache import (
-    get_cached, set_cache, delete_cache, invalidate_pattern,
-    CACHE_KEYS, CACHE_TTL
+    cached_endpoint, invalidate_namespace,
+    CACHE_TTL
 )
 
 router = APIRouter(prefix="/team", tags=["Team"])
 
-UPLOAD_DIR = "/home/unique/projects/geobiro/backend/uploads/team"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-
-@router.get("", response_model=List[TeamMemberResponse])
+@router.get("", response_model=List[TeamMemberSummary])
+@cached_endpoint('team', List[TeamMemberSummary], ttl=CACHE_TTL['team'])
 async def get_team_members(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db('team'))
 ):
-    """Get all team members."""
-    # Try to get from cache
-    cache_key = CACHE_KEYS['team']
-    cached_data = await get_cached(cache_key)
-    if cached_data:
-        return cached_data
-    
-    members = db.query(TeamMember).order_by(TeamMember.created_at.desc()).all()
-    
-    # Cache result
-    await set_cache(
-        cache_key,
-        [TeamMemberResponse.from_orm(m).dict() for m in members],
-        ttl=CACHE_TTL['team']
-    )
-    
-    return members
+    """Get all team members (without bios; see the detail endpoint)."""
+    return (await db.scalars(
+        select(TeamMember)
+        .options(defer(TeamMember.bio_en), defer(TeamMember.bio_fa))
+        .order_by(TeamMember.created_at.desc())
+    )).all()
 
 
 @router.get("/{member_id}", response_model=TeamMemberResponse)
+@cached_endpoint('team', TeamMemberResponse, ttl=CACHE_TTL['team'])
 async def get_team_member(
     member_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db('team'))
 ):
     """Get a specific team member."""
-    # Try to get from cache
-    cache_key = CACHE_KEYS['team_member'].format(id=member_id)
-    cached_data = await get_cached(cache_key)
-    if cached_data:
-        return cached_data
-    
-    member = db.query(TeamMember).filter(TeamMember.id == member_id).first()
+    member = await db.scalar(select(TeamMember).where(TeamMember.id == member_id).limit(1))
     if not member:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Team member not found"
         )
-    
-    # Cache result
-    await set_cache(
-        cache_key,
-        TeamMemberResponse.from_orm(member).dict(),
-        ttl=CACHE_TTL['team']
-    )
-    
     return member
 
 
 @router.post("", response_model=TeamMemberResponse, status_code=status.HTTP_201_CREATED)
 async def create_team_member(
     member_data: TeamMemberCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: object = Depends(require_admin)
 ):
     """Create a new team member (admin only)."""
     new_member = TeamMember(**member_data.dict())
     db.add(new_member)
-    db.commit()
-    db.refresh(new_member)
+    await db.commit()
+    await db.refresh(new_member)
     
     # Invalidate cache
-    await invalidate_pattern(CACHE_KEYS['team'] + "*")
+    await invalidate_namespace('team')
     
     return new_member
 
@@ -96,44 +74,29 @@ async def create_team_member(
 async def upload_team_member_image(
     member_id: int,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: object = Depends(require_admin)
 ):
     """Upload image for team member."""
-    member = db.query(TeamMember).filter(TeamMember.id == member_id).first()
+    member = await db.scalar(select(TeamMember).where(TeamMember.id == member_id).limit(1))
     if not member:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Team member not found"
         )
     
-    # Validate file type
-    allowed_extensions = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
-    file_ext = os.path.splitext(file.filename)[1].lower()
-    if file_ext not in allowed_extensions:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid file type. Allowed: jpg, jpeg, png, webp, gif"
-        )
-    
-    # Save file
+    # Validate and store the image (streamed, size-limited, type from content)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"member_{member_id}_{timestamp}{file_ext}"
-    filepath = os.path.join(UPLOAD_DIR, filename)
-    
-    with open(filepath, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    stored = await save_image(file, "team", f"member_{member_id}_{timestamp}")
     
     # Update member with image URL
-    image_url = f"/uploads/team/{filename}"
+    image_url = stored.url
     member.image_url = image_url
-    db.commit()
-    db.refresh(member)
+    await db.commit()
+    await db.refresh(member)
     
     # Invalidate cache
-    await invalidate_pattern(CACHE_KEYS['team'] + "*")
-    cache_key = CACHE_KEYS['team_member'].format(id=member_id)
-    await delete_cache(cache_key)
+    await invalidate_namespace('team')
     
     return {
         "success": True,
@@ -142,15 +105,72 @@ async def upload_team_member_image(
     }
 
 
+@router.post("/batch", response_model=List[TeamMemberResponse], status_code=status.HTTP_201_CREATED)
+async def create_team_members_batch(
+    batch: BatchCreate[TeamMemberCreate],
+    db: AsyncSession = Depends(get_db),
+    admin: object = Depends(require_admin)
+):
+    """Create several team members in one transaction (admin only)."""
+    rows = [item.dict() for item in batch.items]
+    team_members = await create_many(db, TeamMember, rows)
+    await db.commit()
+    # Bulk statements bypass the session hooks that queue image derivatives
+    image_derivatives.schedule(TeamMember, [member.id for member in team_members])
+    
+    # Invalidate cache once for the whole batch
+    await invalidate_namespace('team')
+    
+    return team_members
+
+
+@router.put("/batch", response_model=List[TeamMemberResponse])
+async def update_team_members_batch(
+    batch: BatchUpdate[TeamMemberBatchUpdateItem],
+    db: AsyncSession = Depends(get_db),
+    admin: object = Depends(require_admin)
+):
+    """Update several team members in one transaction (admin only)."""
+    rows = [item.dict(exclude_unset=True) for item in batch.items]
+    team_members = await update_many(db, TeamMember, rows)
+    await db.commit()
+    # Bulk statements bypass the session hooks that queue image derivatives
+    image_derivatives.schedule(TeamMember, [member.id for member in team_members])
+    
+    # Invalidate cache once for the whole batch
+    await invalidate_namespace('team')
+    
+    return team_members
+
+
+@router.post("/batch/delete", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_team_members_batch(
+    batch: BatchDelete,
+    db: AsyncSession = Depends(get_db),
+    admin: object = Depends(require_admin)
+):
+    """Delete several team members in one transaction (admin only)."""
+    variants = await image_derivatives.load_variants(db, TeamMember, batch.ids)
+    await delete_many(db, TeamMember, batch.ids)
+    await db.commit()
+    # Bulk statements bypass the session hooks that remove image derivatives
+    image_derivatives.discard(variants)
+    
+    # Invalidate cache once for the whole batch
+    await invalidate_namespace('team')
+    
+    return None
+
+
 @router.put("/{member_id}", response_model=TeamMemberResponse)
 async def update_team_member(
     member_id: int,
     member_data: TeamMemberUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: object = Depends(require_admin)
 ):
     """Update a team member (admin only)."""
-    member = db.query(TeamMember).filter(TeamMember.id == member_id).first()
+    member = await db.scalar(select(TeamMember).where(TeamMember.id == member_id).limit(1))
     if not member:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -161,13 +181,11 @@ async def update_team_member(
     for field, value in update_data.items():
         setattr(member, field, value)
     
-    db.commit()
-    db.refresh(member)
+    await db.commit()
+    await db.refresh(member)
     
     # Invalidate cache
-    await invalidate_pattern(CACHE_KEYS['team'] + "*")
-    cache_key = CACHE_KEYS['team_member'].format(id=member_id)
-    await delete_cache(cache_key)
+    await invalidate_namespace('team')
     
     return member
 
@@ -175,21 +193,19 @@ async def update_team_member(
 @router.delete("/{member_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_team_member(
     member_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin: object = Depends(require_admin)
 ):
     """Delete a team member (admin only)."""
-    member = db.query(TeamMember).filter(TeamMember.id == member_id).first()
+    member = await db.scalar(select(TeamMember).where(TeamMember.id == member_id).limit(1))
     if not member:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Team member not found"
         )
     
-    db.delete(member)
-    db.commit()
+    await db.delete(member)
+    await db.commit()
     
     # Invalidate cache
-    await invalidate_pattern(CACHE_KEYS['team'] + "*")
-    cache_key = CACHE_KEYS['team_member'].format(id=member_id)
-    await delete_cache(cache_key)
+    await invalidate_namespace('team')
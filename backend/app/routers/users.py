@@ -1,32 +1,35 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app.database import get_db
 from app.models.models import User
 from app.schemas.schemas import UserCreate, UserUpdate, UserResponse
 from app.core.security import require_admin, hash_password
+from app.core.concurrency import run_password_hashing
+from app.cache import invalidate_namespace
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @router.get("", response_model=List[UserResponse], dependencies=[Depends(require_admin)])
-async def get_users(db: Session = Depends(get_db)):
+async def get_users(db: AsyncSession = Depends(get_db)):
     """Get all users (admin only)."""
-    users = db.query(User).order_by(User.created_at.desc()).all()
+    users = (await db.scalars(select(User).order_by(User.created_at.desc()))).all()
     return users
 
 
 @router.post("", response_model=UserResponse, dependencies=[Depends(require_admin)])
 async def create_user(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new user (admin only)."""
     # Check if user exists
-    existing_user = db.query(User).filter(
+    existing_user = await db.scalar(select(User).where(
         (User.username == user_data.username) | (User.email == user_data.email)
-    ).first()
+    ).limit(1))
 
     if existing_user:
         raise HTTPException(
@@ -38,14 +41,14 @@ async def create_user(
     new_user = User(
         username=user_data.username,
         email=user_data.email,
-        hashed_password=hash_password(user_data.password),
+        hashed_password=await run_password_hashing(hash_password, user_data.password),
         is_admin=False,  # Default to non-admin, admin can change later
         is_active=True
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
     return new_user
 
@@ -54,10 +57,10 @@ async def create_user(
 async def update_user(
     user_id: int,
     user_data: UserUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update a user (admin only)."""
-    db_user = db.query(User).filter(User.id == user_id).first()
+    db_user = await db.scalar(select(User).where(User.id == user_id).limit(1))
     if not db_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
@@ -65,10 +68,10 @@ async def update_user(
 
     # Check for duplicate username/email if being updated
     if 'username' in update_data and update_data['username'] != db_user.username:
-        existing = db.query(User).filter(
+        existing = await db.scalar(select(User).where(
             User.username == update_data['username'],
             User.id != user_id
-        ).first()
+        ).limit(1))
         if existing:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -76,10 +79,10 @@ async def update_user(
             )
 
     if 'email' in update_data and update_data['email'] != db_user.email:
-        existing = db.query(User).filter(
+        existing = await db.scalar(select(User).where(
             User.email == update_data['email'],
             User.id != user_id
-        ).first()
+        ).limit(1))
         if existing:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -90,8 +93,11 @@ async def update_user(
         setattr(db_user, field, value)
 
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+
+    # Drop cached principals so role/activation changes apply immediately
+    await invalidate_namespace('principals')
 
     return db_user
 
@@ -99,14 +105,17 @@ async def update_user(
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(require_admin)])
 async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete a user (admin only)."""
-    db_user = db.query(User).filter(User.id == user_id).first()
+    db_user = await db.scalar(select(User).where(User.id == user_id).limit(1))
     if not db_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    db.delete(db_user)
-    db.commit()
+    await db.delete(db_user)
+    await db.commit()
+
+    # Drop cached principals so the deleted user's tokens stop working
+    await invalidate_namespace('principals')
 
     return None
\ No newline at end of file
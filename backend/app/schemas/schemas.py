@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, Field, computed_field, model_validator
+from typing import Optional, List, Dict, Generic, TypeVar
 from datetime import datetime
 
 
@@ -73,6 +73,44 @@ class ServiceResponse(ServiceBase):
         from_attributes = True
 
 
+# ============ Image Schemas ============
+
+class ImageVariant(BaseModel):
+    width: int
+    url: str
+
+
+class ImageVariants(BaseModel):
+    """Resized copies of an image, per format, narrowest first."""
+    source: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    formats: Dict[str, List[ImageVariant]] = Field(default_factory=dict)
+
+
+class ResponsiveImage(BaseModel):
+    """Adds the resized copies of ``image_url`` to a response, once generated."""
+    image_variants: Optional[ImageVariants] = None
+
+    @model_validator(mode="after")
+    def _drop_stale_variants(self):
+        # Copies of a previous image until the background worker catches up
+        if self.image_variants is not None and self.image_variants.source != self.image_url:
+            self.image_variants = None
+        return self
+
+    @computed_field
+    @property
+    def image_srcset(self) -> Optional[Dict[str, str]]:
+        """``srcset`` attribute value per format, e.g. {"webp": "/uploads/a-320w.webp 320w, ..."}."""
+        if self.image_variants is None or not self.image_variants.formats:
+            return None
+        return {
+            name: ", ".join(f"{variant.url} {variant.width}w" for variant in variants)
+            for name, variants in self.image_variants.formats.items()
+        }
+
+
 # ============ Team Member Schemas ============
 
 class TeamMemberBase(BaseModel):
@@ -103,7 +141,7 @@ class TeamMemberUpdate(BaseModel):
     bio_fa: Optional[str] = None
 
 
-class TeamMemberResponse(TeamMemberBase):
+class TeamMemberResponse(TeamMemberBase, ResponsiveImage):
     id: int
     created_at: datetime
     updated_at: datetime
@@ -112,6 +150,23 @@ class TeamMemberResponse(TeamMemberBase):
         from_attributes = True
 
 
+
+class TeamMemberSummary(ResponsiveImage):
+    """Team list card: the bios are only returned by the detail endpoint."""
+    id: int
+    name_en: str
+    name_fa: Optional[str] = None
+    position_en: Optional[str] = None
+    position_fa: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    image_url: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
 # ============ Certificate Schemas ============
 
 class CertificateBase(BaseModel):
@@ -138,7 +193,7 @@ class CertificateUpdate(BaseModel):
     expiry_date: Optional[str] = None
 
 
-class CertificateResponse(CertificateBase):
+class CertificateResponse(CertificateBase, ResponsiveImage):
     id: int
     created_at: datetime
     updated_at: datetime
@@ -173,7 +228,7 @@ class LicenseUpdate(BaseModel):
     issue_authority: Optional[str] = None
 
 
-class LicenseResponse(LicenseBase):
+class LicenseResponse(LicenseBase, ResponsiveImage):
     id: int
     created_at: datetime
     updated_at: datetime
@@ -309,7 +364,7 @@ class ProjectUpdate(BaseModel):
     is_featured: Optional[bool] = None
 
 
-class ProjectResponse(ProjectBase):
+class ProjectResponse(ProjectBase, ResponsiveImage):
     id: int
     created_at: datetime
     updated_at: datetime
@@ -318,6 +373,26 @@ class ProjectResponse(ProjectBase):
         from_attributes = True
 
 
+
+class ProjectSummary(ResponsiveImage):
+    """Project list card: a short excerpt instead of the full descriptions."""
+    id: int
+    title_en: str
+    title_fa: Optional[str] = None
+    excerpt_en: Optional[str] = None
+    excerpt_fa: Optional[str] = None
+    image_url: Optional[str] = None
+    archive_url: Optional[str] = None
+    iframe_url: Optional[str] = None
+    category: Optional[str] = None
+    order: int = 0
+    is_featured: bool = False
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
 # ============ Article Schemas ============
 
 class ArticleBase(BaseModel):
@@ -362,3 +437,101 @@ class ArticleResponse(ArticleBase):
     
     class Config:
         from_attributes = True
+
+
+
+class ArticleSummary(BaseModel):
+    """Article list card: everything but the content."""
+    id: int
+    title_en: str
+    title_fa: Optional[str] = None
+    slug: str
+    summary_en: str
+    summary_fa: Optional[str] = None
+    image_url: Optional[str] = None
+    tags: Optional[str] = None
+    category: Optional[str] = None
+    author: Optional[str] = None
+    is_published: bool
+    publish_date: datetime
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class ArticleSearchHit(ArticleSummary):
+    """Search result; highlights wrap matched words in <mark>."""
+    rank: Optional[float] = None
+    title_highlight_en: Optional[str] = None
+    title_highlight_fa: Optional[str] = None
+    snippet_en: Optional[str] = None
+    snippet_fa: Optional[str] = None
+
+
+class ArticleSearchResponse(BaseModel):
+    items: List[ArticleSearchHit]
+    has_more: bool
+
+class TagCountResponse(BaseModel):
+    name: str
+    count: int
+    
+    class Config:
+        from_attributes = True
+
+
+
+# ============ Pagination Schemas ============
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """One keyset page; pass a cursor back as ``?cursor=`` to move."""
+    items: List[T]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+# ============ Batch Schemas ============
+
+MAX_BATCH_SIZE = 500
+
+
+class BatchCreate(BaseModel, Generic[T]):
+    items: List[T] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchUpdate(BaseModel, Generic[T]):
+    """Partial updates; each item carries the id plus the fields to change."""
+    items: List[T] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchDelete(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class ServiceBatchUpdateItem(ServiceUpdate):
+    id: int
+
+
+class TeamMemberBatchUpdateItem(TeamMemberUpdate):
+    id: int
+
+
+class CertificateBatchUpdateItem(CertificateUpdate):
+    id: int
+
+
+class LicenseBatchUpdateItem(LicenseUpdate):
+    id: int
+
+
+class ProjectBatchUpdateItem(ProjectUpdate):
+    id: int
+
+
+class ArticleBatchUpdateItem(ArticleUpdate):
+    id: int
@@ -20,8 +20,8 @@ backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
 
 from sqlalchemy.orm import Session
-from app.database import SessionLocal, engine
-from app.models.models import User, Base
+from app.database import SessionLocal, run_migrations
+from app.models.models import User
 from app.core.security import hash_password
 
 
@@ -112,9 +112,9 @@ def main():
     args = parser.parse_args()
 
     try:
-        # Ensure database tables exist
-        Base.metadata.create_all(bind=engine)
-        print("Database tables verified/created")
+        # Ensure the schema is up to date
+        run_migrations()
+        print("Database migrations applied")
 
         # Create admin user
         admin_user = create_admin_user(
@@ -0,0 +1,119 @@
+"""
+Article search.
+
+On PostgreSQL this uses the ``articles.search_vector`` column and its GIN
+index (migration 0004): the query is matched in both the English and the
+``simple`` (Persian) configuration, ranked with ``ts_rank_cd``, and only
+the rows of the requested page get highlighted snippets. Other databases
+(SQLite in development) fall back to an unranked substring match.
+"""
+import re
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
+
+from app.models.models import Article
+from app.schemas.schemas import ArticleSummary
+
+MAX_TERMS = 8
+
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=12, MaxFragments=2"
+
+search_vector = literal_column("articles.search_vector")
+
+
+def build_tsquery(q: str) -> Optional[str]:
+    """
+    ``to_tsquery`` text for a user query: every word must match, and the
+    last one may be a prefix so results update while typing.
+    """
+    terms = re.findall(r"\w+", q)[:MAX_TERMS]
+    if not terms:
+        return None
+    terms[-1] += ":*"
+    return " & ".join(terms)
+
+
+def _card(article: Article) -> Dict[str, Any]:
+    return {name: getattr(article, name) for name in ArticleSummary.model_fields}
+
+
+def _plain_text(column):
+    return func.regexp_replace(func.coalesce(column, ""), "<[^>]+>", " ", "g")
+
+
+async def search_articles(db: AsyncSession, q: str, skip: int, limit: int) -> Dict[str, Any]:
+    """One page of published articles matching ``q``, best matches first."""
+    if db.bind.dialect.name != "postgresql":
+        return await _search_fallback(db, q, skip, limit)
+
+    text = build_tsquery(q)
+    if text is None:
+        return {"items": [], "has_more": False}
+    tsquery = func.to_tsquery("english", text).op("||")(func.to_tsquery("simple", text))
+    rank = func.ts_rank_cd(search_vector, tsquery)
+
+    # Rank and page on the index first, then highlight only this page
+    ranked = (
+        select(Article.id, rank.label("rank"))
+        .where(Article.is_published == True, search_vector.op("@@")(tsquery))
+        .order_by(rank.desc(), Article.publish_date.desc(), Article.id.desc())
+        .offset(skip)
+        .limit(limit + 1)
+        .subquery()
+    )
+    rows = (await db.execute(
+        select(
+            Article,
+            ranked.c.rank,
+            func.ts_headline("english", Article.title_en, tsquery, "HighlightAll=true"),
+            func.ts_headline("simple", func.coalesce(Article.title_fa, ""), tsquery, "HighlightAll=true"),
+            func.ts_headline(
+                "english",
+                func.concat_ws(" ", Article.summary_en, _plain_text(Article.content_en)),
+                tsquery, HEADLINE_OPTIONS
+            ),
+            func.ts_headline(
+                "simple",
+                func.concat_ws(" ", Article.summary_fa, _plain_text(Article.content_fa)),
+                tsquery, HEADLINE_OPTIONS
+            ),
+        )
+        .join(ranked, ranked.c.id == Article.id)
+        .options(defer(Article.content_en), defer(Article.content_fa))
+        .order_by(ranked.c.rank.desc(), Article.publish_date.desc(), Article.id.desc())
+    )).all()
+
+    items: List[Dict[str, Any]] = [
+        {
+            **_card(article),
+            "rank": rank_value,
+            "title_highlight_en": title_en,
+            "title_highlight_fa": title_fa or None,
+            "snippet_en": snippet_en,
+            "snippet_fa": snippet_fa or None,
+        }
+        for article, rank_value, title_en, title_fa, snippet_en, snippet_fa in rows[:limit]
+    ]
+    return {"items": items, "has_more": len(rows) > limit}
+
+
+async def _search_fallback(db: AsyncSession, q: str, skip: int, limit: int) -> Dict[str, Any]:
+    terms = re.findall(r"\w+", q)[:MAX_TERMS]
+    if not terms:
+        return {"items": [], "has_more": False}
+    query = select(Article).options(
+        defer(Article.content_en), defer(Article.content_fa)
+    ).where(Article.is_published == True)
+    for term in terms:
+        query = query.where(or_(
+            Article.title_en.contains(term), Article.title_fa.contains(term),
+            Article.summary_en.contains(term), Article.summary_fa.contains(term),
+        ))
+    articles = (await db.scalars(
+        query.order_by(Article.publish_date.desc(), Article.id.desc()).offset(skip).limit(limit + 1)
+    )).all()
+    items = [{**_card(article), "rank": None} for article in articles[:limit]]
+    return {"items": items, "has_more": len(articles) > limit}
@@ -0,0 +1,144 @@
+"""
+Keep the article_tags association and tag counts in sync with Article.tags.
+
+Article.tags stays the comma-separated text the admin enters (and the API
+returns); every flush that adds, edits or deletes an article rewrites that
+article's rows in article_tags and recounts the affected tags, so reads
+never have to split strings. The hook is registered on import (see
+app/database.py) and covers the API, the seeders and any other session.
+"""
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import delete, event, func, insert, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.models import Article, ArticleTag, Tag
+
+MAX_TAG_LENGTH = 100
+
+# INSERT ... ON CONFLICT constructs of the supported databases
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def parse_tags(value: Optional[str]) -> List[str]:
+    """Split a comma-separated tag string into unique, trimmed names."""
+    names: List[str] = []
+    for part in (value or "").split(","):
+        name = part.strip()[:MAX_TAG_LENGTH]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def _tag_ids(conn: Connection, names: List[str]) -> List[int]:
+    """Ids for these tag names, creating the missing tags."""
+    if not names:
+        return []
+    # A concurrent write may create the same new tag: skip it instead of failing
+    ids = dict(conn.execute(
+        _UPSERT_INSERTS[conn.dialect.name](Tag)
+        .values([{"name": name, "article_count": 0} for name in names])
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(Tag.name, Tag.id)
+    ).all())
+    existing = [name for name in names if name not in ids]
+    if existing:
+        ids.update(conn.execute(select(Tag.name, Tag.id).where(Tag.name.in_(existing))).all())
+    return [ids[name] for name in names]
+
+
+def _article_tag_ids(conn: Connection, article_id: int) -> Set[int]:
+    return set(conn.scalars(select(ArticleTag.tag_id).where(ArticleTag.article_id == article_id)))
+
+
+def set_article_tags(conn: Connection, article_id: int, tags: Optional[str]) -> Set[int]:
+    """Replace an article's tag rows; returns every tag id touched."""
+    old_ids = _article_tag_ids(conn, article_id)
+    new_ids = _tag_ids(conn, parse_tags(tags))
+    if set(new_ids) != old_ids:
+        conn.execute(delete(ArticleTag).where(ArticleTag.article_id == article_id))
+        if new_ids:
+            conn.execute(insert(ArticleTag), [
+                {"article_id": article_id, "tag_id": tag_id} for tag_id in new_ids
+            ])
+    return old_ids | set(new_ids)
+
+
+def refresh_tag_counts(conn: Connection, tag_ids: Iterable[int]):
+    """Recount published articles for the given tags only."""
+    tag_ids = sorted(set(tag_ids))
+    if not tag_ids:
+        return
+    # Serialize recounts of the same tags: under READ COMMITTED, a writer
+    # waiting here recounts after the other commits and sees its rows,
+    # instead of overwriting its count with one that misses them. Id order
+    # avoids deadlocks; FOR NO KEY UPDATE (key_share=True) does not conflict
+    # with the key-share locks taken by article_tags foreign key checks.
+    # SQLite ignores it and serializes writers anyway.
+    conn.execute(
+        select(Tag.id).where(Tag.id.in_(tag_ids)).order_by(Tag.id)
+        .with_for_update(key_share=True)
+    )
+    published = (
+        select(func.count())
+        .select_from(ArticleTag)
+        .join(Article, Article.id == ArticleTag.article_id)
+        .where(ArticleTag.tag_id == Tag.id, Article.is_published == True)
+        .scalar_subquery()
+    )
+    conn.execute(update(Tag).where(Tag.id.in_(tag_ids)).values(article_count=published))
+
+
+def resync_articles(conn: Connection, article_ids: Iterable[int]):
+    """
+    Re-derive tag rows and counts for articles written with bulk
+    statements, which bypass the flush hooks below.
+    """
+    article_ids = list(article_ids)
+    touched: Set[int] = set()
+    rows = conn.execute(select(Article.id, Article.tags).where(Article.id.in_(article_ids))).all()
+    for article_id, tags in rows:
+        touched |= set_article_tags(conn, article_id, tags)
+    refresh_tag_counts(conn, touched)
+
+
+def drop_articles(conn: Connection, article_ids: Iterable[int]):
+    """Remove tag rows of articles about to be bulk-deleted and recount."""
+    article_ids = list(article_ids)
+    touched = set(conn.scalars(
+        select(ArticleTag.tag_id).where(ArticleTag.article_id.in_(article_ids)).distinct()
+    ))
+    conn.execute(delete(ArticleTag).where(ArticleTag.article_id.in_(article_ids)))
+    refresh_tag_counts(conn, touched)
+
+
+def _touched_tags(session: Session) -> Set[int]:
+    return session.info.setdefault("touched_tag_ids", set())
+
+
+@event.listens_for(Session, "before_flush")
+def _drop_deleted_article_tags(session: Session, flush_context, instances):
+    # Rows must go before the article (SQLite does not enforce ON DELETE CASCADE)
+    for obj in session.deleted:
+        if isinstance(obj, Article) and obj.id is not None:
+            conn = session.connection()
+            _touched_tags(session).update(_article_tag_ids(conn, obj.id))
+            conn.execute(delete(ArticleTag).where(ArticleTag.article_id == obj.id))
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_article_tags(session: Session, flush_context):
+    touched = _touched_tags(session)
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Article):
+            continue
+        state = inspect(obj)
+        if obj in session.new or any(
+            state.attrs[name].history.has_changes() for name in ("tags", "is_published")
+        ):
+            touched.update(set_article_tags(session.connection(), obj.id, obj.tags))
+    if touched:
+        refresh_tag_counts(session.connection(), touched)
+        touched.clear()
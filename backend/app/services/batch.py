@@ -0,0 +1,73 @@
+"""
+Helpers for the admin batch endpoints.
+
+Each helper issues one bulk statement for the whole batch (ORM bulk
+INSERT ... RETURNING, bulk UPDATE by primary key, DELETE ... WHERE id IN)
+and does not commit: the endpoint commits once and invalidates its cache
+namespace once. Any error before the commit rolls the whole batch back.
+"""
+from collections import Counter
+from typing import Any, Dict, List, Sequence, Type
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _check_unique_ids(ids: Sequence[int]):
+    duplicates = sorted(i for i, n in Counter(ids).items() if n > 1)
+    if duplicates:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Duplicate ids in batch: {duplicates}"
+        )
+
+
+async def ensure_exist(db: AsyncSession, model: Type[Any], ids: Sequence[int]):
+    """404 unless every id exists (checked before anything is written)."""
+    _check_unique_ids(ids)
+    found = set(await db.scalars(select(model.id).where(model.id.in_(ids))))
+    missing = [i for i in ids if i not in found]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{model.__name__} not found: {missing}"
+        )
+
+
+async def fetch_in_order(db: AsyncSession, model: Type[Any], ids: Sequence[int]) -> List[Any]:
+    """Load rows fresh from the database, in the order of ``ids``."""
+    rows = await db.scalars(
+        select(model).where(model.id.in_(ids)).execution_options(populate_existing=True)
+    )
+    by_id = {row.id: row for row in rows}
+    return [by_id[i] for i in ids]
+
+
+async def create_many(db: AsyncSession, model: Type[Any], rows: List[Dict[str, Any]]) -> List[Any]:
+    """Insert all rows in one statement; returns the new objects in order."""
+    if not rows:
+        return []
+    result = await db.scalars(
+        insert(model).returning(model, sort_by_parameter_order=True), rows
+    )
+    return list(result.all())
+
+
+async def update_many(db: AsyncSession, model: Type[Any], rows: List[Dict[str, Any]]) -> List[Any]:
+    """
+    Apply partial updates (each row has ``id`` plus the changed fields)
+    as one bulk UPDATE by primary key; returns the updated objects.
+    """
+    ids = [row["id"] for row in rows]
+    await ensure_exist(db, model, ids)
+    changes = [row for row in rows if len(row) > 1]
+    if changes:
+        await db.execute(update(model), changes)
+    return await fetch_in_order(db, model, ids)
+
+
+async def delete_many(db: AsyncSession, model: Type[Any], ids: List[int]):
+    """Delete every id in one statement."""
+    await ensure_exist(db, model, ids)
+    await db.execute(delete(model).where(model.id.in_(ids)))
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+from typing import Iterable, Optional, Set
+
+from app.database import AsyncSessionLocal, ReplicaSessionLocal
+from app.routers import services, projects, team, certificates, licenses, contact
+from app import cache
+
+logger = logging.getLogger(__name__)
+
+# Public entries requested by the homepage, per cache namespace:
+# (cached endpoint, query parameters exactly as FastAPI passes them)
+WARMUP_TARGETS = {
+    "services": [(services.get_services, {"category": None})],
+    "projects": [(projects.get_projects, {"category": None, "featured": None})],
+    "team": [(team.get_team_members, {})],
+    "certificates": [(certificates.get_certificates, {})],
+    "licenses": [(licenses.get_licenses, {})],
+    "statistics": [(contact.get_statistics, {})],
+    "company_info": [(contact.get_company_info, {})],
+}
+
+_pending: Set[str] = set()
+_refill_task: Optional[asyncio.Task] = None
+
+
+async def warm_cache(namespaces: Optional[Iterable[str]] = None, primary: bool = False) -> int:
+    """
+    Fill missing warm-up entries; returns how many were filled.
+
+    Reads go to the read replica unless ``primary`` is set (re-fills right
+    after a write must not see a lagging replica).
+    """
+    selected = WARMUP_TARGETS if namespaces is None else [
+        ns for ns in namespaces if ns in WARMUP_TARGETS
+    ]
+    filled = 0
+    session_factory = AsyncSessionLocal if primary else ReplicaSessionLocal
+    async with session_factory() as db:
+        for namespace in selected:
+            for endpoint, params in WARMUP_TARGETS[namespace]:
+                try:
+                    if await endpoint.warm(db=db, **params):
+                        filled += 1
+                except Exception as e:
+                    # e.g. company info not configured yet (404)
+                    logger.warning(f"Cache warm-up skipped {endpoint.__name__}: {e!r}")
+                    await db.rollback()
+    return filled
+
+
+def schedule_refill(namespaces: Iterable[str]):
+    """Re-fill the given namespaces in the background (coalesced)."""
+    global _refill_task
+    _pending.update(ns for ns in namespaces if ns in WARMUP_TARGETS)
+    if not _pending or (_refill_task is not None and not _refill_task.done()):
+        return
+    _refill_task = asyncio.get_running_loop().create_task(_drain())
+
+
+async def _drain():
+    while _pending:
+        batch = list(_pending)
+        _pending.clear()
+        filled = await warm_cache(batch, primary=True)
+        logger.info(f"Cache refilled {filled} entries for {', '.join(batch)}")
+
+
+def register():
+    """Hook re-fills into cache invalidation and Redis reconnects."""
+    if schedule_refill not in cache.refill_hooks:
+        cache.refill_hooks.append(schedule_refill)
@@ -0,0 +1,406 @@
+"""
+Responsive copies of uploaded images.
+
+When a team member, certificate, license or project gets a new local
+``image_url`` (``/uploads/...``), a background worker writes resized,
+re-encoded copies next to the original (``photo-320w.webp``,
+``photo-320w.jpg``, ...) and records them in ``image_variants``:
+
+    {"source": "/uploads/team/photo.png", "width": 3024, "height": 4032,
+     "formats": {"webp": [{"width": 320, "url": "..."}, ...], "jpeg": [...]}}
+
+``source`` ties the copies to the image they were made from, so a row
+whose image changed is never served the old copies (see the response
+schemas) and is picked up again; the worker then deletes the old copies.
+Copies of deleted rows are deleted through ``discard``. Copies are named
+after their source file, so rows sharing an image share them and they
+are kept while any row still uses that image.
+
+Requests that change an image return right away; ORM writes are
+scheduled by the commit hooks below, bulk writes call ``schedule`` /
+``discard`` themselves, and rows missed while the app was down are
+found by the sweep on startup.
+"""
+import asyncio
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from sqlalchemy import event, inspect, null, or_, select, update
+from sqlalchemy.orm import Session
+
+from app import cache
+from app.core.concurrency import run_blocking
+from app.core.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.models import Certificate, License, Project, TeamMember
+from app.services.uploads import UPLOAD_ROOT
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillow is optional; without it images are served as uploaded
+    Image = None
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Models with derivatives -> cache namespace of their endpoints
+IMAGE_MODELS: Dict[type, str] = {
+    TeamMember: "team",
+    Certificate: "certificates",
+    License: "licenses",
+    Project: "projects",
+}
+
+# Format -> (file extension, Pillow encoder options)
+_ENCODERS: Dict[str, Tuple[str, Dict[str, Any]]] = {
+    "webp": (".webp", {"format": "WEBP", "method": 4}),
+    "jpeg": (".jpg", {"format": "JPEG", "optimize": True, "progressive": True}),
+    "avif": (".avif", {"format": "AVIF", "speed": 6}),
+}
+
+# A claim left by a worker that died mid-job expires after this many seconds
+CLAIM_TTL = 300
+
+Job = Tuple[type, int]
+
+_queue: Optional["asyncio.Queue[Job]"] = None
+_queued: Set[Job] = set()
+_workers: List[asyncio.Task] = []
+_cleanups: Set[asyncio.Task] = set()
+
+
+def _widths() -> List[int]:
+    return sorted({int(w) for w in settings.IMAGE_DERIVATIVE_WIDTHS.split(",") if w.strip()})
+
+
+def _formats() -> List[str]:
+    selected = []
+    for name in (f.strip().lower() for f in settings.IMAGE_DERIVATIVE_FORMATS.split(",")):
+        if not name:
+            continue
+        if name not in _ENCODERS or (name != "jpeg" and not features.check(name)):
+            logger.warning(f"Image format {name!r} not supported here; skipped")
+            continue
+        selected.append(name)
+    return selected
+
+
+def _is_local(image_url: Optional[str]) -> bool:
+    return bool(image_url) and image_url.startswith("/uploads/")
+
+
+def is_stale(image_url: Optional[str], variants: Optional[Dict[str, Any]]) -> bool:
+    """Whether a row holds copies of another image, or a local image has none yet."""
+    if variants:
+        return variants.get("source") != image_url
+    return _is_local(image_url)
+
+
+def _local_path(image_url: str) -> Optional[Path]:
+    """File behind an ``/uploads/...`` URL, if it exists inside the upload root."""
+    path = (UPLOAD_ROOT / image_url[len("/uploads/"):]).resolve()
+    if UPLOAD_ROOT.resolve() not in path.parents or not path.is_file():
+        return None
+    return path
+
+
+def _target_widths(width: int) -> List[int]:
+    """Configured widths below the original, plus the original if it is smaller than the largest."""
+    widths = [w for w in _widths() if w <= width]
+    if width < max(_widths()) and width not in widths:
+        widths.append(width)
+    return widths
+
+
+def _save_atomically(image: "Image.Image", path: Path, options: Dict[str, Any]):
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".derivative-", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            image.save(tmp, quality=settings.IMAGE_DERIVATIVE_QUALITY, **options)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def render_derivatives(image_url: str, formats: List[str]) -> Dict[str, Any]:
+    """
+    Write the resized copies of a local image (blocking; Pillow releases
+    the GIL while resizing and encoding) and return its ``image_variants``.
+    """
+    variants: Dict[str, Any] = {"source": image_url, "formats": {}}
+    path = _local_path(image_url)
+    if path is None:
+        return variants
+
+    with Image.open(path) as original:
+        # Full size as displayed, before drafting (EXIF orientations 5-8 swap the sides)
+        width, height = original.size
+        if original.getexif().get(0x0112) in (5, 6, 7, 8):
+            width, height = height, width
+        variants["width"], variants["height"] = width, height
+
+        # Let the JPEG decoder skip detail no copy needs (square box: EXIF may rotate)
+        largest = max(_widths())
+        original.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+        image.load()
+
+    # Largest first, each copy resized from the previous one
+    source = image
+    for width in sorted(_target_widths(image.width), reverse=True):
+        height = max(1, round(image.height * width / image.width))
+        resized = source.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+        resized.info = {}  # no EXIF, ICC or comments in the copies
+        source = resized
+        flat = None
+        for name in formats:
+            extension, options = _ENCODERS[name]
+            copy = resized
+            if name == "jpeg" and resized.mode == "RGBA":
+                if flat is None:
+                    flat = Image.new("RGB", resized.size, (255, 255, 255))
+                    flat.paste(resized, mask=resized.getchannel("A"))
+                copy = flat
+            target = path.with_name(f"{path.stem}-{width}w{extension}")
+            _save_atomically(copy, target, options)
+            url = "/uploads/" + target.relative_to(UPLOAD_ROOT.resolve()).as_posix()
+            variants["formats"].setdefault(name, []).insert(0, {"width": width, "url": url})
+    return variants
+
+
+def _variant_urls(variants: Optional[Dict[str, Any]]) -> Set[str]:
+    return {
+        variant["url"]
+        for copies in ((variants or {}).get("formats") or {}).values()
+        for variant in copies
+    }
+
+
+def _remove_files(urls: Iterable[str]):
+    for url in urls:
+        path = _local_path(url) if _is_local(url) else None
+        if path is not None:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+async def _image_in_use(image_url: str) -> bool:
+    async with AsyncSessionLocal() as db:
+        for model in IMAGE_MODELS:
+            if (await db.execute(select(model.id).where(model.image_url == image_url).limit(1))).first():
+                return True
+    return False
+
+
+async def _remove_copies(variants: Optional[Dict[str, Any]], keep: Iterable[str] = ()):
+    """Delete the files of ``variants`` unless some row still uses their source."""
+    urls = _variant_urls(variants) - set(keep)
+    if not urls or await _image_in_use(variants.get("source")):
+        return
+    await run_blocking(_remove_files, urls)
+
+
+async def _remove_all(variants_list: List[Dict[str, Any]]):
+    for variants in variants_list:
+        try:
+            await _remove_copies(variants)
+        except Exception as e:
+            logger.warning(f"Removing image derivatives of {variants.get('source')} failed: {e!r}")
+
+
+def discard(variants_list: Iterable[Optional[Dict[str, Any]]]):
+    """Delete the copies of removed rows in the background (no-op until ``start``)."""
+    variants_list = [variants for variants in variants_list if variants]
+    if _queue is None or not variants_list:
+        return
+    task = asyncio.get_running_loop().create_task(_remove_all(variants_list))
+    _cleanups.add(task)
+    task.add_done_callback(_cleanups.discard)
+
+
+async def load_variants(db, model: type, ids: Iterable[int]) -> List[Dict[str, Any]]:
+    """``image_variants`` of these rows, read before they are bulk-deleted."""
+    return [
+        variants for variants in await db.scalars(
+            select(model.image_variants).where(model.id.in_(list(ids)))
+        ) if variants
+    ]
+
+
+def _claim_key(model: type, obj_id: int, image_url: str) -> str:
+    return f"derivatives:{model.__tablename__}:{obj_id}:{image_url}"
+
+
+async def _claim(model: type, obj_id: int, image_url: str) -> bool:
+    """Keep several app workers from encoding the same image at once."""
+    if cache.redis_client is None:
+        return True
+    try:
+        key = _claim_key(model, obj_id, image_url)
+        return bool(await cache.redis_client.set(key, cache.WORKER_ID, nx=True, ex=CLAIM_TTL))
+    except Exception as e:
+        logger.warning(f"Claiming image derivatives for {image_url} failed: {e!r}", exc_info=True)
+        return True
+
+
+async def _release(model: type, obj_id: int, image_url: str):
+    if cache.redis_client is None:
+        return
+    try:
+        await cache.redis_client.delete(_claim_key(model, obj_id, image_url))
+    except Exception as e:
+        logger.warning(f"Releasing image derivative claim for {image_url} failed: {e!r}", exc_info=True)
+
+
+async def _process(model: type, obj_id: int, formats: List[str]):
+    async with AsyncSessionLocal() as db:
+        row = (await db.execute(
+            select(model.image_url, model.image_variants).where(model.id == obj_id)
+        )).first()
+    if row is None or not is_stale(row.image_url, row.image_variants):
+        return
+    image_url = row.image_url
+    if not await _claim(model, obj_id, image_url or ""):
+        return
+    try:
+        await _replace_variants(model, obj_id, image_url, row.image_variants, formats)
+    finally:
+        await _release(model, obj_id, image_url or "")
+
+
+async def _replace_variants(
+    model: type,
+    obj_id: int,
+    image_url: Optional[str],
+    old_variants: Optional[Dict[str, Any]],
+    formats: List[str]
+):
+    variants = None
+    if _is_local(image_url):
+        try:
+            variants = await run_blocking(render_derivatives, image_url, formats)
+        except Exception as e:
+            # Not an image Pillow can read (or a decompression bomb): keep the original only
+            logger.warning(f"Image derivatives failed for {image_url}: {e!r}")
+            variants = {"source": image_url, "formats": {}}
+
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(model)
+            .where(model.id == obj_id, model.image_url == image_url)
+            .values(image_variants=variants if variants is not None else null())
+        )
+        await db.commit()
+    if result.rowcount:
+        await cache.invalidate_namespace(IMAGE_MODELS[model])
+        if variants is not None:
+            logger.info(f"Image derivatives ready for {image_url}")
+        # Copies of the image this row used before
+        await _remove_copies(old_variants, keep=_variant_urls(variants))
+
+
+async def _work(formats: List[str]):
+    while True:
+        job = await _queue.get()
+        _queued.discard(job)
+        try:
+            await _process(*job, formats)
+        except Exception as e:
+            logger.error(f"Image derivative job {job[0].__name__} {job[1]} failed: {e!r}")
+        finally:
+            _queue.task_done()
+
+
+def schedule(model: type, ids: Iterable[int]):
+    """Queue rows whose image may have changed (no-op until ``start``)."""
+    if _queue is None or model not in IMAGE_MODELS:
+        return
+    for obj_id in ids:
+        job = (model, obj_id)
+        if job not in _queued:
+            _queued.add(job)
+            _queue.put_nowait(job)
+
+
+async def _sweep():
+    """Queue every row whose local image has no up-to-date copies."""
+    try:
+        async with AsyncSessionLocal() as db:
+            for model in IMAGE_MODELS:
+                rows = (await db.execute(
+                    select(model.id, model.image_url, model.image_variants)
+                    .where(or_(model.image_url.like("/uploads/%"), model.image_variants.isnot(None)))
+                )).all()
+                schedule(model, [row.id for row in rows if is_stale(row.image_url, row.image_variants)])
+    except Exception as e:
+        logger.warning(f"Image derivative sweep failed: {e!r}")
+
+
+def start():
+    """Start the derivative workers and queue images missed while stopped."""
+    global _queue
+    if Image is None:
+        logger.warning("Pillow is not installed; image derivatives are disabled")
+        return
+    formats = _formats()
+    if not formats or not _widths():
+        return
+    _queue = asyncio.Queue()
+    for _ in range(max(1, settings.IMAGE_DERIVATIVE_WORKERS)):
+        _workers.append(asyncio.create_task(_work(formats)))
+    _workers.append(asyncio.create_task(_sweep()))
+
+
+async def stop():
+    global _queue
+    await asyncio.gather(*_cleanups, return_exceptions=True)
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    _queued.clear()
+    _queue = None
+
+
+def _jobs(session: Session) -> Set[Job]:
+    return session.info.setdefault("derivative_jobs", set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_images(session: Session, flush_context):
+    for obj in list(session.new) + list(session.dirty):
+        if type(obj) in IMAGE_MODELS and (
+            obj in session.new and obj.image_url
+            or obj not in session.new and inspect(obj).attrs.image_url.history.has_changes()
+        ):
+            _jobs(session).add((type(obj), obj.id))
+    for obj in session.deleted:
+        if type(obj) in IMAGE_MODELS:
+            # Loaded value only: the row is already gone
+            variants = inspect(obj).dict.get("image_variants")
+            if variants:
+                session.info.setdefault("discarded_variants", []).append(variants)
+
+
+@event.listens_for(Session, "after_commit")
+def _schedule_changed_images(session: Session):
+    for model, obj_id in session.info.pop("derivative_jobs", ()):
+        schedule(model, [obj_id])
+    discard(session.info.pop("discarded_variants", ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_images(session: Session):
+    session.info.pop("derivative_jobs", None)
+    session.info.pop("discarded_variants", None)
@@ -0,0 +1,132 @@
+"""
+Store uploaded images under ``backend/uploads`` (served at ``/uploads``).
+
+Every upload endpoint goes through ``save_image``: the file is copied in
+fixed-size chunks to a temporary file next to its destination, off the
+event loop, and the copy stops as soon as it exceeds ``UPLOAD_MAX_SIZE``.
+The type comes from the file's first bytes, not its name or Content-Type,
+and the finished file is renamed into place atomically, so readers never
+see partial files. Memory use per upload is one chunk, whatever the size.
+"""
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from fastapi import HTTPException, UploadFile, status
+
+from app.core.concurrency import run_blocking
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Matches the StaticFiles mount in main.py
+UPLOAD_ROOT = Path(__file__).resolve().parent.parent.parent / "uploads"
+
+CHUNK_SIZE = 64 * 1024
+
+# Leading bytes of each accepted image format -> stored extension
+_SIGNATURES = (
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+)
+
+
+@dataclass(frozen=True)
+class StoredUpload:
+    filename: str
+    path: Path
+    url: str
+    size: int
+
+
+def detect_image_type(header: bytes) -> Optional[str]:
+    """Extension for the image format ``header`` starts with, if accepted."""
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return ".webp"
+    for signature, extension in _SIGNATURES:
+        if header.startswith(signature):
+            return extension
+    return None
+
+
+def safe_stem(filename: Optional[str]) -> str:
+    """A client-supplied file name reduced to a harmless stem."""
+    stem = re.sub(r"[^\w-]+", "_", Path(filename or "").stem).strip("_")
+    return stem[:50] or "file"
+
+
+class _Rejected(Exception):
+    def __init__(self, status_code: int, detail: str):
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _store(source: BinaryIO, directory: Path, stem: str, max_size: int) -> StoredUpload:
+    """Blocking part of ``save_image``; runs in the blocking thread pool."""
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+    try:
+        size = 0
+        extension = None
+        with os.fdopen(fd, "wb") as tmp:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                if extension is None:
+                    extension = detect_image_type(chunk)
+                    if extension is None:
+                        raise _Rejected(
+                            status.HTTP_400_BAD_REQUEST,
+                            "Invalid file type (JPEG, PNG, WebP or GIF images only)"
+                        )
+                size += len(chunk)
+                if size > max_size:
+                    raise _Rejected(
+                        status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        f"File too large (max {max_size // (1024 * 1024)}MB)"
+                    )
+                tmp.write(chunk)
+            if extension is None:
+                raise _Rejected(status.HTTP_400_BAD_REQUEST, "Empty file")
+            tmp.flush()
+            os.fsync(tmp.fileno())
+
+        filename = f"{stem}{extension}"
+        path = directory / filename
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+    url = "/uploads/" + path.relative_to(UPLOAD_ROOT).as_posix()
+    return StoredUpload(filename=filename, path=path, url=url, size=size)
+
+
+async def save_image(
+    file: UploadFile,
+    subdirectory: str,
+    stem: str,
+    max_size: Optional[int] = None
+) -> StoredUpload:
+    """
+    Validate and store an uploaded image as ``uploads/<subdirectory>/<stem><ext>``.
+
+    Raises 400 for anything that is not a JPEG, PNG, WebP or GIF image and
+    413 when the file is larger than ``max_size`` (``UPLOAD_MAX_SIZE``).
+    """
+    directory = UPLOAD_ROOT / subdirectory if subdirectory else UPLOAD_ROOT
+    try:
+        return await run_blocking(
+            _store, file.file, directory, stem, max_size or settings.UPLOAD_MAX_SIZE
+        )
+    except _Rejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+GeoBiro Backend - Auth Throughput Benchmark
+Measures login throughput, and public endpoint latency while logins are under load.
+
+Run against a running server, with this machine exempt from rate limits:
+    RATE_LIMIT_EXEMPT_IPS=127.0.0.1 uvicorn main:app
+    python benchmark_auth.py
+    python benchmark_auth.py --concurrency 32 --duration 20
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from typing import List
+
+import requests
+
+API_URL = "http://localhost:8000/api"
+
+RATE_LIMITED_HINT = (
+    "Rate limited by the server: restart it with RATE_LIMIT_EXEMPT_IPS=<this machine's address> "
+    "(or RATE_LIMIT_ENABLED=false) so the benchmark measures logins, not 429s"
+)
+
+BENCH_USER = {
+    "username": "bench_user",
+    "email": "bench@geobiro.ba",
+    "password": "BenchPassword123"
+}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def print_latencies(title: str, values: List[float]):
+    """Print count and latency percentiles (values in seconds)."""
+    print(f"\n{'='*60}")
+    print(f"⏱  {title}")
+    print(f"{'='*60}")
+    if not values:
+        print("No samples")
+        return
+    print(f"Samples: {len(values)}")
+    print(f"p50:     {percentile(values, 50) * 1000:.1f} ms")
+    print(f"p95:     {percentile(values, 95) * 1000:.1f} ms")
+    print(f"p99:     {percentile(values, 99) * 1000:.1f} ms")
+    print(f"max:     {max(values) * 1000:.1f} ms")
+    print(f"mean:    {statistics.mean(values) * 1000:.1f} ms")
+
+
+def ensure_bench_user():
+    """Register the benchmark user (already existing is fine)."""
+    response = requests.post(f"{API_URL}/auth/register", json=BENCH_USER)
+    if response.status_code == 429:
+        raise RuntimeError(RATE_LIMITED_HINT)
+    if response.status_code not in (201, 400):
+        raise RuntimeError(f"Could not register benchmark user: {response.status_code} {response.text}")
+
+
+def sample_public(session: requests.Session, path: str, count: int, interval: float = 0.0) -> List[float]:
+    """Time ``count`` sequential GETs of a public endpoint."""
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        response = session.get(f"{API_URL}{path}")
+        latencies.append(time.perf_counter() - started)
+        response.raise_for_status()
+        if interval:
+            time.sleep(interval)
+    return latencies
+
+
+def login_worker(stop: threading.Event, latencies: List[float], errors: List[int]):
+    """Log in repeatedly until ``stop`` is set."""
+    session = requests.Session()
+    payload = {"username": BENCH_USER["username"], "password": BENCH_USER["password"]}
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = session.post(f"{API_URL}/auth/login", json=payload)
+        elapsed = time.perf_counter() - started
+        if response.status_code == 200:
+            latencies.append(elapsed)
+        else:
+            errors.append(response.status_code)
+
+
+def run_benchmark(concurrency: int, duration: float, public_path: str, samples: int):
+    """Baseline public latency, then logins under load with public latency sampled alongside."""
+    ensure_bench_user()
+    session = requests.Session()
+
+    # Warm the public endpoint's cache so both phases measure the same path
+    sample_public(session, public_path, 5)
+    baseline = sample_public(session, public_path, samples)
+
+    login_latencies: List[float] = []
+    login_errors: List[int] = []
+    stop = threading.Event()
+    workers = [
+        threading.Thread(target=login_worker, args=(stop, login_latencies, login_errors), daemon=True)
+        for _ in range(concurrency)
+    ]
+
+    print(f"\n🔐 {concurrency} concurrent login clients for {duration:.0f}s ...")
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+
+    under_load: List[float] = []
+    while time.perf_counter() - started < duration:
+        under_load.extend(sample_public(session, public_path, 1, interval=0.05))
+
+    stop.set()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    print_latencies(f"GET {public_path} (idle)", baseline)
+    print_latencies(f"GET {public_path} (during logins)", under_load)
+    print_latencies("POST /auth/login", login_latencies)
+
+    print(f"\n{'='*60}")
+    print(f"✅ Summary")
+    print(f"{'='*60}")
+    print(f"Logins:       {len(login_latencies)} in {elapsed:.1f}s")
+    print(f"Throughput:   {len(login_latencies) / elapsed:.1f} logins/s")
+    print(f"Login errors: {len(login_errors)} {sorted(set(login_errors)) if login_errors else ''}")
+    if 429 in login_errors:
+        print(f"⚠️  {RATE_LIMITED_HINT}")
+    if baseline and under_load:
+        slowdown = percentile(under_load, 95) / percentile(baseline, 95)
+        print(f"Public p95 under load: {slowdown:.1f}x idle")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark login throughput and public latency under login load")
+    parser.add_argument("--url", default=API_URL, help="API base URL")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent login clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of login load")
+    parser.add_argument("--public-path", default="/services", help="public endpoint sampled for latency")
+    parser.add_argument("--samples", type=int, default=50, help="idle latency samples")
+    args = parser.parse_args()
+
+    API_URL = args.url.rstrip("/")
+    run_benchmark(args.concurrency, args.duration, args.public_path, args.samples)
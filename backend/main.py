@@ -1,18 +1,18 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status, HTTPException
 from fastapi.responses import JSONResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
 
 from app.core.config import get_settings
-from app.database import engine
-from app.models.models import Base
-from app.cache import init_redis
-from app.routers import auth, services, team, certificates, licenses, contact, projects, articles, users, upload
+from app.cache import init_redis, close_redis
+from app.core.concurrency import LoopBlockDetector, shutdown_executor, start_password_workers
+from app.core import query_stats
+from app.core.http_cache import CompressibleGZipMiddleware
+from app.routers import auth, services, team, certificates, licenses, contact, projects, articles, users, upload, metrics
+from app.services import cache_warmup, image_derivatives
 
 # Configure logging
 logging.basicConfig(
@@ -24,33 +24,35 @@ logger = logging.getLogger(__name__)
 # Initialize settings
 settings = get_settings()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-# Rate limiter
-limiter = Limiter(key_func=get_remote_address)
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application startup and shutdown."""
     # Startup
     logger.info("🚀 Starting GeoBiro FastAPI Backend")
-    init_redis()
+    loop_detector = None
+    if settings.DEBUG and settings.LOOP_BLOCK_WARN_MS > 0:
+        loop_detector = LoopBlockDetector(settings.LOOP_BLOCK_WARN_MS)
+        loop_detector.start()
+    start_password_workers()
+    await init_redis()
+    cache_warmup.register()
+    warmup_task = None
+    if settings.CACHE_WARMUP_ON_STARTUP:
+        warmup_task = asyncio.create_task(cache_warmup.warm_cache())
+    image_derivatives.start()
     
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down GeoBiro FastAPI Backend")
-
-
-# Exception handlers (define before using in app initialization)
-def _rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
-    """Handle rate limit exceeded."""
-    return JSONResponse(
-        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-        content={"detail": "Too many requests. Please try again later."}
-    )
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    await image_derivatives.stop()
+    await close_redis()
+    if loop_detector is not None:
+        await loop_detector.stop()
+    shutdown_executor()
 
 
 # Create FastAPI app
@@ -63,9 +65,10 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# Add rate limiter to app
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+# Compress uncached responses (cached endpoints already carry Content-Encoding);
+# uploads, video and other already-compressed media pass through untouched.
+# Added before the logging middleware so it sees whole, unstreamed bodies.
+app.add_middleware(CompressibleGZipMiddleware, minimum_size=settings.GZIP_MIN_SIZE)
 
 # Request logging middleware
 @app.middleware("http")
@@ -76,6 +79,38 @@ async def log_requests(request: Request, call_next):
     return response
 
 
+
+# SQL statements per request (optional Server-Timing header; query-count and
+# repeated-query warnings are logged either way)
+@app.middleware("http")
+async def track_queries(request: Request, call_next):
+    stats = query_stats.start_request()
+    response = await call_next(request)
+    if settings.SERVER_TIMING:
+        response.headers.append("Server-Timing", stats.server_timing())
+    query_stats.log_repeated_queries(stats, request.method, request.url.path)
+    return response
+
+
+# Refuse multipart bodies declared larger than an upload may be before they
+# are spooled to disk (save_image still enforces the limit on the file itself)
+UPLOAD_FORM_OVERHEAD = 64 * 1024
+
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    content_length = request.headers.get("content-length", "")
+    if (
+        request.headers.get("content-type", "").startswith("multipart/form-data")
+        and content_length.isdigit()
+        and int(content_length) > settings.UPLOAD_MAX_SIZE + UPLOAD_FORM_OVERHEAD
+    ):
+        return JSONResponse(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            content={"detail": f"File too large (max {settings.UPLOAD_MAX_SIZE // (1024 * 1024)}MB)"}
+        )
+    return await call_next(request)
+
 # CORS Configuration
 app.add_middleware(
     CORSMiddleware,
@@ -132,6 +167,7 @@ app.include_router(certificates.router, prefix="/api")
 app.include_router(licenses.router, prefix="/api")
 app.include_router(contact.router, prefix="/api")
 app.include_router(users.router, prefix="/api")
+app.include_router(metrics.router, prefix="/api")
 
 
 # Health check endpoint
@@ -49,5 +49,18 @@ try:
 except Exception as e:
     print(f"✗ Exception: {e}")
 
+# Test 4: A literal "None" filter must not share the unfiltered list's cache entry
+print("\n4. GET /articles?tag=None")
+try:
+    before = requests.get(f"{BASE_URL}/articles").json()
+    filtered = requests.get(f"{BASE_URL}/articles", params={"tag": "None"}).json()
+    after = requests.get(f"{BASE_URL}/articles").json()
+    if after == before:
+        print(f"✓ Unfiltered list unchanged ({len(after)} articles, {len(filtered)} tagged 'None')")
+    else:
+        print(f"✗ Unfiltered list changed: {len(before)} -> {len(after)} articles")
+except Exception as e:
+    print(f"✗ Exception: {e}")
+
 print("\n" + "-" * 50)
 print("Tests completed!")